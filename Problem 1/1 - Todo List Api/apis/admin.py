@@ -1,8 +1,13 @@
 from django.contrib import admin
 
 from apis.models import Todo
+from apis.pagination import EstimatedCountPaginator
 
 
 @admin.register(Todo)
 class TodoAdmin(admin.ModelAdmin):
     list_display = ("id", "title", "text")
+    paginator = EstimatedCountPaginator
+    # The unfiltered total shown next to filtered results is another
+    # COUNT(*) over the whole table.
+    show_full_result_count = False
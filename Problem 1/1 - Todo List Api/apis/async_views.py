@@ -0,0 +1,141 @@
+import json
+from urllib.parse import urlencode
+
+from django.http import HttpResponse
+from django.views import View
+
+from .fastpath import ReadPlan
+from .models import Todo
+from .pagination import ToDoCursorPagination
+from .renderers import FastJSONRenderer
+from .serializers import ToDoSerializer
+
+
+def json_response(data, status=200):
+    return HttpResponse(
+        FastJSONRenderer().render(data), status=status, content_type="application/json"
+    )
+
+
+def not_found():
+    return json_response({"detail": "Not found."}, status=404)
+
+
+class AsyncAPIView(View):
+    """
+    Django view with async handlers, served without a thread hop under
+    ASGI.
+
+    Requests are validated with the DRF serializers, whose validation of
+    `Todo` runs no queries, and every query goes through the async ORM
+    interface. Like DRF's APIView the views are exempt from CSRF checks.
+    """
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        view.csrf_exempt = True
+        return view
+
+    def parse_body(self, request):
+        """Return the JSON body of `request`, or None if it is not valid."""
+        try:
+            data = json.loads(request.body or b"{}")
+        except ValueError:
+            return None
+        return data if isinstance(data, dict) else None
+
+    def query_int(self, request, name, default, minimum, maximum):
+        try:
+            value = int(request.GET[name])
+        except (KeyError, ValueError):
+            return default
+        return max(minimum, min(value, maximum))
+
+
+class AsyncToDoListView(AsyncAPIView):
+    """
+    `GET` lists todos by id with keyset pagination, `next` carries the last
+    id of the page in `?after=`. `POST` creates a todo.
+    """
+
+    plan = ReadPlan.compile(ToDoSerializer())
+
+    async def get(self, request):
+        page_size = self.query_int(
+            request,
+            ToDoCursorPagination.page_size_query_param,
+            ToDoCursorPagination.page_size,
+            1,
+            ToDoCursorPagination.max_page_size,
+        )
+        after = self.query_int(request, "after", 0, 0, 2**63 - 1)
+
+        queryset = (
+            Todo.objects.filter(id__gt=after)
+            .order_by("id")
+            .values_list(*self.plan.columns)
+        )
+        rows = [row async for row in queryset[: page_size + 1]]
+
+        next_url = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            last_id = rows[-1][self.plan.columns.index("id")]
+            query = request.GET.copy()
+            query["after"] = last_id
+            next_url = request.build_absolute_uri(
+                f"{request.path}?{urlencode(sorted(query.items()))}"
+            )
+        return json_response({"next": next_url, "results": self.plan.serialize(rows)})
+
+    async def post(self, request):
+        data = self.parse_body(request)
+        if data is None:
+            return json_response({"detail": "Invalid JSON object."}, status=400)
+
+        serializer = ToDoSerializer(data=data)
+        if not serializer.is_valid():
+            return json_response(serializer.errors, status=400)
+        todo = await Todo.objects.acreate(**serializer.validated_data)
+        return json_response(ToDoSerializer(todo).data, status=201)
+
+
+class AsyncToDoDetailView(AsyncAPIView):
+    """Retrieve, update and delete one todo."""
+
+    async def get(self, request, pk):
+        try:
+            todo = await Todo.objects.aget(pk=pk)
+        except Todo.DoesNotExist:
+            return not_found()
+        return json_response(ToDoSerializer(todo).data)
+
+    async def put(self, request, pk):
+        return await self.update(request, pk, partial=False)
+
+    async def patch(self, request, pk):
+        return await self.update(request, pk, partial=True)
+
+    async def update(self, request, pk, partial):
+        data = self.parse_body(request)
+        if data is None:
+            return json_response({"detail": "Invalid JSON object."}, status=400)
+        try:
+            todo = await Todo.objects.aget(pk=pk)
+        except Todo.DoesNotExist:
+            return not_found()
+
+        serializer = ToDoSerializer(todo, data=data, partial=partial)
+        if not serializer.is_valid():
+            return json_response(serializer.errors, status=400)
+        for name, value in serializer.validated_data.items():
+            setattr(todo, name, value)
+        await todo.asave()
+        return json_response(ToDoSerializer(todo).data)
+
+    async def delete(self, request, pk):
+        deleted, _ = await Todo.objects.filter(pk=pk).adelete()
+        if not deleted:
+            return not_found()
+        return HttpResponse(status=204)
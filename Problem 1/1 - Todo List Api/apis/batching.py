@@ -0,0 +1,156 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections, connection, transaction
+
+from apis.cache import bump_version
+from apis.models import Todo
+
+COALESCE_WRITES = getattr(settings, "TODO_COALESCE_WRITES", False)
+WRITE_BATCH_SIZE = getattr(settings, "TODO_WRITE_BATCH_SIZE", 500)
+WRITE_BATCH_DELAY = getattr(settings, "TODO_WRITE_BATCH_DELAY", 0.005)
+WRITE_RESULT_TIMEOUT = getattr(settings, "TODO_WRITE_RESULT_TIMEOUT", 30)
+
+
+class BatchWriter:
+    """
+    Background thread inserting todos submitted from many requests in
+    shared transactions.
+
+    A batch is flushed once it holds `batch_size` rows or `delay` seconds
+    after its first row arrived, so a burst of creates costs one commit
+    (and one fsync) per batch instead of one per request. `submit()`
+    returns a future resolved with the saved `Todo` once its batch has
+    committed, a request only answers after its row is durable.
+    """
+
+    def __init__(self, batch_size=WRITE_BATCH_SIZE, delay=WRITE_BATCH_DELAY):
+        self.batch_size = batch_size
+        self.delay = delay
+        self.queue = queue.Queue()
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def submit(self, validated_data):
+        """
+        Queue a row, restarting the thread if it is not running. A future
+        that is cancelled before its batch is collected is never written.
+        """
+        future = Future()
+        self.start()
+        self.queue.put((validated_data, future))
+        return future
+
+    def start(self):
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(
+                    target=self.run, name="todo-batch-writer", daemon=True
+                )
+                self.thread.start()
+
+    def stop(self):
+        """Flush what is queued and end the thread."""
+        with self.lock:
+            if self.thread is not None:
+                self.queue.put(None)
+                self.thread.join()
+                self.thread = None
+
+    def run(self):
+        try:
+            while self.collect():
+                pass
+        finally:
+            connection.close()
+
+    def collect(self):
+        """Flush the next batch, return False once `stop()` was called."""
+        item = self.queue.get()
+        if item is None:
+            return False
+        batch = []
+        self.take(batch, item)
+        deadline = time.monotonic() + self.delay
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self.queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                self.flush(batch)
+                return False
+            self.take(batch, item)
+        self.flush(batch)
+        return True
+
+    @staticmethod
+    def take(batch, item):
+        # Once running, the future can no longer be cancelled by its request.
+        if item[1].set_running_or_notify_cancel():
+            batch.append(item)
+
+    def flush(self, batch):
+        """Write `batch` and resolve every one of its futures, never raise."""
+        if not batch:
+            return
+        try:
+            # The thread outlives requests, let CONN_MAX_AGE and health checks
+            # apply to its connection as they do to request threads.
+            close_old_connections()
+            todos = [Todo(**validated_data) for validated_data, _ in batch]
+            try:
+                with transaction.atomic():
+                    Todo.objects.bulk_create(todos)
+                    transaction.on_commit(bump_version)
+            except DatabaseError:
+                # Do not fail the whole batch for one bad row, retry them alone.
+                for validated_data, future in batch:
+                    self.flush_one(validated_data, future)
+                return
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        for todo, (_, future) in zip(todos, batch):
+            future.set_result(todo)
+
+    @staticmethod
+    def flush_one(validated_data, future):
+        try:
+            with transaction.atomic():
+                todo = Todo.objects.create(**validated_data)
+        except Exception as exc:
+            future.set_exception(exc)
+        else:
+            future.set_result(todo)
+
+
+batch_writer = BatchWriter()
+
+
+class CoalescedCreateMixin:
+    """Hand `create` writes to the batch writer when TODO_COALESCE_WRITES is on."""
+
+    def perform_create(self, serializer):
+        if not COALESCE_WRITES:
+            return super().perform_create(serializer)
+        future = batch_writer.submit(serializer.validated_data)
+        try:
+            serializer.instance = future.result(timeout=WRITE_RESULT_TIMEOUT)
+        except FutureTimeoutError:
+            if not future.cancel():
+                # Already part of a batch being written, wait for it once more.
+                serializer.instance = future.result(timeout=WRITE_RESULT_TIMEOUT)
+                return
+            # The writer never picked the row up, write it from the request.
+            super().perform_create(serializer)
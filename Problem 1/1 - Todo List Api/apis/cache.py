@@ -0,0 +1,123 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+
+VERSION_KEY = "apis:todo:version"
+RESPONSE_KEY_PREFIX = "apis:todo:response"
+RESPONSE_CACHE_TIMEOUT = getattr(settings, "TODO_RESPONSE_CACHE_TIMEOUT", 300)
+# A local-memory cache is per process, a version bumped by another worker
+# never reaches it, so its responses and version are only kept this long.
+LOCAL_CACHE_TIMEOUT = getattr(settings, "TODO_LOCAL_CACHE_TIMEOUT", 5)
+
+
+def is_local_cache():
+    return isinstance(caches["default"], LocMemCache)
+
+
+def get_version():
+    """Return the current version of the Todo table."""
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # Seed from the clock so that a version evicted from the cache can
+        # never come back with a value an older response was stored under.
+        cache.add(VERSION_KEY, time.time_ns(), timeout=get_version_timeout())
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def bump_version():
+    """Invalidate every cached Todo response."""
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, time.time_ns(), timeout=get_version_timeout())
+
+
+def get_version_timeout():
+    # Expiring reseeds the version from the clock, which is how a process
+    # with a local cache eventually drops ETags of data changed elsewhere.
+    return LOCAL_CACHE_TIMEOUT if is_local_cache() else None
+
+
+def get_response_timeout():
+    if is_local_cache():
+        return min(RESPONSE_CACHE_TIMEOUT, LOCAL_CACHE_TIMEOUT)
+    return RESPONSE_CACHE_TIMEOUT
+
+
+class CachedReadMixin:
+    """
+    Serve `list` and `retrieve` from a response cache keyed on the table
+    version, with a strong ETag derived from the same key.
+
+    A request whose `If-None-Match` matches the current ETag gets a 304
+    before the queryset or serializer is touched, a cache hit returns the
+    stored bytes as they were rendered the first time.
+
+    Only JSON responses to anonymous requests are cached, a browsable API
+    page carries the user's name and CSRF token.
+    """
+
+    response_cache_key = None
+    response_etag = None
+
+    def list(self, request, *args, **kwargs):
+        response = self.get_cached_response(request)
+        if response is None:
+            response = super().list(request, *args, **kwargs)
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        response = self.get_cached_response(request)
+        if response is None:
+            response = super().retrieve(request, *args, **kwargs)
+        return response
+
+    def is_cacheable(self, request):
+        return (
+            getattr(settings, "TODO_RESPONSE_CACHE", True)
+            and request.accepted_renderer.format == "json"
+            and not request.user.is_authenticated
+        )
+
+    def get_cached_response(self, request):
+        if not self.is_cacheable(request):
+            return None
+        version = get_version()
+        digest = hashlib.sha1(
+            f"{request.accepted_media_type} {request.build_absolute_uri()}".encode()
+        ).hexdigest()
+        self.response_cache_key = f"{RESPONSE_KEY_PREFIX}:{version}:{digest}"
+        self.response_etag = f'"{version:x}-{digest[:16]}"'
+
+        response = get_conditional_response(request, etag=self.response_etag)
+        if response is None:
+            cached = cache.get(self.response_cache_key)
+            if cached is None:
+                return None
+            content, content_type = cached
+            response = HttpResponse(content, content_type=content_type)
+
+        response["ETag"] = self.response_etag
+        return response
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        cacheable = self.response_cache_key and response.status_code == 200
+        if cacheable and "ETag" not in response:
+            response.render()
+            cache.set(
+                self.response_cache_key,
+                (response.content, response["Content-Type"]),
+                get_response_timeout(),
+            )
+            response["ETag"] = self.response_etag
+        if self.response_cache_key:
+            # Shared caches must not hand the anonymous copy to a logged-in user.
+            patch_vary_headers(response, ("Cookie", "Authorization"))
+        return response
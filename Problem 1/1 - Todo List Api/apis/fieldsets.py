@@ -0,0 +1,85 @@
+from rest_framework.compat import coreapi, coreschema
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+FIELDS_PARAM = "fields"
+EXCLUDE_PARAM = "exclude"
+
+
+def _split(value):
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+
+def get_requested_fields(request, available):
+    """
+    Return the names of `available` selected by the comma separated `?fields=`
+    and `?exclude=` query parameters, in `available` order, or None when the
+    request asks for every field.
+    """
+    include = _split(request.query_params.get(FIELDS_PARAM, ""))
+    exclude = _split(request.query_params.get(EXCLUDE_PARAM, ""))
+    if not include and not exclude:
+        return None
+
+    errors = {}
+    for param, names in ((FIELDS_PARAM, include), (EXCLUDE_PARAM, exclude)):
+        unknown = [name for name in names if name not in available]
+        if unknown:
+            errors[param] = [f"Unknown field(s): {', '.join(unknown)}."]
+    if errors:
+        raise ValidationError(errors)
+
+    return tuple(
+        name
+        for name in available
+        if (not include or name in include) and name not in exclude
+    )
+
+
+class SparseFieldsetFilter(BaseFilterBackend):
+    """
+    Push `?fields=` / `?exclude=` down into the queryset with `.only()`, so
+    columns that are not rendered are not read either.
+
+    The view must provide `get_requested_fields()`.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        if request.method != "GET":
+            return queryset
+        fields = view.get_requested_fields()
+        if fields is None:
+            return queryset
+        return queryset.only(*fields)
+
+    def get_schema_fields(self, view):
+        assert coreapi is not None, "coreapi must be installed for schema fields"
+        assert coreschema is not None, "coreschema must be installed for schema fields"
+        return [
+            coreapi.Field(
+                name=name,
+                required=False,
+                location="query",
+                schema=coreschema.String(title=name.title(), description=description),
+            )
+            for name, description in self._descriptions()
+        ]
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": name,
+                "required": False,
+                "in": "query",
+                "description": description,
+                "schema": {"type": "string"},
+            }
+            for name, description in self._descriptions()
+        ]
+
+    @staticmethod
+    def _descriptions():
+        return (
+            (FIELDS_PARAM, "Comma separated fields to return, all by default."),
+            (EXCLUDE_PARAM, "Comma separated fields to leave out."),
+        )
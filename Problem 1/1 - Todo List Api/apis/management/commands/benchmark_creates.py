@@ -0,0 +1,74 @@
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from apis.batching import BatchWriter
+from apis.models import Todo
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare create throughput of concurrent clients committing one "
+        "transaction per todo with clients sharing a BatchWriter, on a "
+        "scratch test database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--clients", type=int, default=16)
+        parser.add_argument("--creates", type=int, default=200)
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as directory:
+            if connection.vendor == "sqlite":
+                # A file rather than the in-memory default, so every client
+                # thread sees the same database.
+                test_settings = connection.settings_dict["TEST"]
+                test_settings["NAME"] = str(Path(directory) / "benchmark.sqlite3")
+            old_name = connection.creation.create_test_db(
+                verbosity=0, autoclobber=True, serialize=False
+            )
+            try:
+                self.run_modes(options)
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def run_modes(self, options):
+        writer = BatchWriter()
+        modes = [
+            ("per request", lambda data: Todo.objects.create(**data)),
+            ("coalesced", lambda data: writer.submit(data).result()),
+        ]
+        self.stdout.write(f"{'mode':<12} {'creates/s':>10}")
+        try:
+            for name, create in modes:
+                elapsed = self.run_clients(
+                    create, options["clients"], options["creates"]
+                )
+                total = options["clients"] * options["creates"]
+                self.stdout.write(f"{name:<12} {total / elapsed:>10.0f}")
+        finally:
+            writer.stop()
+
+    @staticmethod
+    def run_clients(create, clients, creates):
+        def client(number):
+            try:
+                for i in range(creates):
+                    create({"title": f"benchmark-creates {number}-{i}"})
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=client, args=(number,))
+            for number in range(clients)
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return time.perf_counter() - start
@@ -0,0 +1,71 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from apis.fastpath import ReadPlan
+from apis.models import Todo
+from apis.renderers import FastJSONRenderer
+from apis.serializers import ToDoSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare rendering todos through ToDoSerializer and JSONRenderer with "
+        "the values_list() read plan and FastJSONRenderer. Rows are inserted "
+        "in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows", type=int, nargs="+", default=[1_000, 10_000, 100_000]
+        )
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"{'rows':>8} {'serializer':>12} {'read plan':>12} {'speedup':>8}"
+        )
+        for rows in options["rows"]:
+            with transaction.atomic():
+                self.populate(rows)
+                slow = self.measure(self.serializer_path, options["repeat"])
+                fast = self.measure(self.plan_path, options["repeat"])
+                if self.serializer_path() != self.plan_path():
+                    raise CommandError(
+                        "The read plan output differs from the serializer"
+                    )
+                transaction.set_rollback(True)
+
+            self.stdout.write(
+                f"{rows:>8} {slow * 1000:>10.1f}ms {fast * 1000:>10.1f}ms "
+                f"{slow / fast:>7.1f}x"
+            )
+
+    @staticmethod
+    def populate(rows):
+        Todo.objects.all().delete()
+        Todo.objects.bulk_create(
+            Todo(title=f"todo {i}", text=f"text of todo {i} " * 8) for i in range(rows)
+        )
+
+    @staticmethod
+    def serializer_path():
+        queryset = Todo.objects.order_by("id")
+        return JSONRenderer().render(ToDoSerializer(queryset, many=True).data)
+
+    @staticmethod
+    def plan_path():
+        plan = ReadPlan.compile(ToDoSerializer())
+        rows = Todo.objects.order_by("id").values_list(*plan.columns)
+        return FastJSONRenderer().render(plan.serialize(rows))
+
+    @staticmethod
+    def measure(path, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            path()
+            timings.append(time.perf_counter() - start)
+        return min(timings)
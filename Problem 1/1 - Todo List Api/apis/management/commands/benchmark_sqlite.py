@@ -0,0 +1,125 @@
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apis.db import apply_pragmas
+
+READ_SQL = "SELECT id, title, text FROM todo ORDER BY id DESC LIMIT 100"
+WRITE_SQL = "INSERT INTO todo (title, text) VALUES (?, ?)"
+
+
+class Workload:
+    """
+    Reader and writer threads hammering one SQLite file.
+
+    Without `persistent` every operation opens its own connection, as
+    Django does per request with CONN_MAX_AGE = 0.
+    """
+
+    def __init__(self, path, pragmas, persistent):
+        self.path = path
+        self.pragmas = pragmas
+        self.persistent = persistent
+        self.lock = threading.Lock()
+        self.counts = {"reads": 0, "writes": 0, "errors": 0}
+
+    def connect(self):
+        # Autocommit, like Django's SQLite backend.
+        connection = sqlite3.connect(self.path, isolation_level=None)
+        apply_pragmas(connection.cursor(), self.pragmas)
+        return connection
+
+    def run(self, readers, writers, duration):
+        deadline = time.monotonic() + duration
+        threads = [
+            threading.Thread(target=self.loop, args=(self.read, "reads", deadline))
+            for _ in range(readers)
+        ] + [
+            threading.Thread(target=self.loop, args=(self.write, "writes", deadline))
+            for _ in range(writers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return self.counts
+
+    def loop(self, operation, counter, deadline):
+        connection = self.connect() if self.persistent else None
+        done = errors = 0
+        while time.monotonic() < deadline:
+            current = connection or self.connect()
+            try:
+                operation(current)
+                done += 1
+            except sqlite3.OperationalError:
+                errors += 1
+            finally:
+                if connection is None:
+                    current.close()
+        if connection is not None:
+            connection.close()
+        with self.lock:
+            self.counts[counter] += done
+            self.counts["errors"] += errors
+
+    @staticmethod
+    def read(connection):
+        connection.execute(READ_SQL).fetchall()
+
+    @staticmethod
+    def write(connection):
+        connection.execute(WRITE_SQL, ("benchmark", "written by a writer thread"))
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure concurrent read/write throughput on a scratch SQLite file "
+        "with the default configuration and with the production profile "
+        "(SQLITE_PRODUCTION_PRAGMAS and persistent connections)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--readers", type=int, default=8)
+        parser.add_argument("--writers", type=int, default=2)
+        parser.add_argument("--duration", type=float, default=5.0)
+        parser.add_argument("--rows", type=int, default=10_000)
+
+    def handle(self, *args, **options):
+        profiles = [
+            ("default", {}, False),
+            ("production", settings.SQLITE_PRODUCTION_PRAGMAS, True),
+        ]
+        self.stdout.write(
+            f"{'profile':<12} {'reads/s':>10} {'writes/s':>10} {'errors':>8}"
+        )
+        for name, pragmas, persistent in profiles:
+            with tempfile.TemporaryDirectory() as directory:
+                path = Path(directory) / "benchmark.sqlite3"
+                self.populate(path, options["rows"])
+                counts = Workload(path, pragmas, persistent).run(
+                    options["readers"], options["writers"], options["duration"]
+                )
+            self.stdout.write(
+                f"{name:<12} "
+                f"{counts['reads'] / options['duration']:>10.0f} "
+                f"{counts['writes'] / options['duration']:>10.0f} "
+                f"{counts['errors']:>8}"
+            )
+
+    @staticmethod
+    def populate(path, rows):
+        with sqlite3.connect(path) as connection:
+            connection.execute(
+                "CREATE TABLE todo "
+                "(id INTEGER PRIMARY KEY, title VARCHAR(100), text TEXT)"
+            )
+            connection.executemany(
+                WRITE_SQL, ((f"todo {i}", f"text {i}") for i in range(rows))
+            )
+        connection.close()
@@ -0,0 +1,28 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from apis.models import Todo
+from apis.streaming import CHUNK_SIZE, EXPORTERS
+
+
+class Command(BaseCommand):
+    help = "Stream every todo to a NDJSON or CSV file in constant memory."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "output", nargs="?", default="-", help="File to write, `-` for stdout."
+        )
+        parser.add_argument("--format", choices=EXPORTERS, default="ndjson")
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        chunks = EXPORTERS[options["format"]](
+            Todo.objects.all(), chunk_size=options["chunk_size"]
+        )
+        if options["output"] == "-":
+            sys.stdout.writelines(chunks)
+            return
+
+        with open(options["output"], "w", encoding="utf-8", newline="") as output:
+            output.writelines(chunks)
@@ -0,0 +1,39 @@
+import sys
+
+from django.core.management.base import BaseCommand
+from drf_yasg.renderers import OpenAPIRenderer, SwaggerYAMLRenderer
+
+from core.schema import render_schema
+
+RENDERERS = {"json": OpenAPIRenderer, "yaml": SwaggerYAMLRenderer}
+
+
+class Command(BaseCommand):
+    help = (
+        "Write the OpenAPI document of the API to a file, so that it can be "
+        "published as a static artifact instead of generated per request."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("output", help="File to write, '-' for stdout.")
+        parser.add_argument("--format", choices=RENDERERS, default="json")
+        parser.add_argument(
+            "--url",
+            help="Base URL of the API, sets the host and scheme of the document.",
+        )
+        parser.add_argument("--api-version", default="")
+
+    def handle(self, *args, **options):
+        content = render_schema(
+            RENDERERS[options["format"]],
+            version=options["api_version"],
+            url=options["url"],
+        )
+        if options["output"] == "-":
+            sys.stdout.buffer.write(content)
+            sys.stdout.flush()
+            return
+
+        with open(options["output"], "wb") as output:
+            output.write(content)
+        self.stdout.write(f"Wrote {len(content)} bytes to {options['output']}")
@@ -0,0 +1,33 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from apis.streaming import CHUNK_SIZE, READERS, import_todos
+
+
+class Command(BaseCommand):
+    help = "Load todos from a NDJSON or CSV file with chunked bulk inserts."
+
+    def add_arguments(self, parser):
+        parser.add_argument("input", help="File to read, `-` for stdin.")
+        parser.add_argument("--format", choices=READERS, default="ndjson")
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        if options["input"] == "-":
+            result = self.load(sys.stdin, options)
+        else:
+            with open(options["input"], encoding="utf-8", newline="") as lines:
+                result = self.load(lines, options)
+
+        for error in result["errors"]:
+            self.stderr.write(f"line {error['line']}: {error['errors']}")
+        self.stdout.write(
+            self.style.SUCCESS(f"Created {result['created']} todos")
+            + (f", {result['failed']} rows failed" if result["failed"] else "")
+        )
+
+    @staticmethod
+    def load(lines, options):
+        rows = READERS[options["format"]](lines)
+        return import_todos(rows, chunk_size=options["chunk_size"])
@@ -0,0 +1,98 @@
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# What a worker imports before it serves its first request.
+STARTUP_SCRIPT = """
+import django
+from django.core.wsgi import get_wsgi_application
+from django.urls import get_resolver
+
+get_wsgi_application()
+get_resolver().url_patterns
+"""
+
+
+def parse_importtime(output):
+    """Return `(module, self_us, cumulative_us, depth)` for `-X importtime` lines."""
+    imports = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        imports.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return imports
+
+
+class Command(BaseCommand):
+    help = (
+        "Report the modules imported while a worker starts, measured with "
+        "`python -X importtime` in a fresh interpreter, grouped by package."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--top", type=int, default=15)
+        parser.add_argument(
+            "--json", action="store_true", help="Print the report as JSON."
+        )
+        parser.add_argument(
+            "--budget",
+            type=float,
+            help="Fail when the imports take longer than this many ms.",
+        )
+
+    def handle(self, *args, **options):
+        env = {**os.environ, "DJANGO_SETTINGS_MODULE": os.environ.get(
+            "DJANGO_SETTINGS_MODULE", settings.SETTINGS_MODULE
+        )}
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", STARTUP_SCRIPT],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode:
+            lines = result.stderr.strip().splitlines()
+            raise CommandError((lines or [f"exit status {result.returncode}"])[-1])
+
+        imports = parse_importtime(result.stderr)
+        total_us = sum(self_us for _, self_us, _, _ in imports)
+        packages = defaultdict(int)
+        for name, self_us, _, _ in imports:
+            packages[name.partition(".")[0]] += self_us
+        top_packages = sorted(packages.items(), key=lambda item: -item[1])
+        top_packages = top_packages[: options["top"]]
+        top_modules = sorted(imports, key=lambda item: -item[1])[: options["top"]]
+
+        if options["json"]:
+            report = {
+                "total_ms": round(total_us / 1000, 1),
+                "modules": len(imports),
+                "packages": {name: round(us / 1000, 1) for name, us in top_packages},
+            }
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            self.stdout.write(
+                f"{len(imports)} modules imported in {total_us / 1000:.1f}ms\n"
+            )
+            self.stdout.write(f"{'package':<32} {'ms':>8}")
+            for name, self_us in top_packages:
+                self.stdout.write(f"{name:<32} {self_us / 1000:>8.1f}")
+            self.stdout.write(f"\n{'module':<48} {'self ms':>8} {'total ms':>9}")
+            for name, self_us, cumulative_us, _ in top_modules:
+                self.stdout.write(
+                    f"{name:<48} {self_us / 1000:>8.1f} {cumulative_us / 1000:>9.1f}"
+                )
+
+        if options["budget"] is not None and total_us / 1000 > options["budget"]:
+            raise CommandError(
+                f"Imports took {total_us / 1000:.1f}ms, "
+                f"over the {options['budget']:.0f}ms budget."
+            )
@@ -0,0 +1,178 @@
+import asyncio
+import json
+import statistics
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Connection:
+    """Minimal keep-alive HTTP/1.1 client, enough for JSON API responses."""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = self.writer = None
+
+    async def request(self, method, path, body=b""):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(
+                self.host, self.port
+            )
+        head = (
+            f"{method} {path} HTTP/1.1\r\n"
+            f"Host: {self.host}:{self.port}\r\n"
+            "Accept: application/json\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n"
+        )
+        self.writer.write(head.encode() + body)
+        await self.writer.drain()
+
+        status = int((await self.reader.readline()).split()[1])
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding") == "chunked":
+            content = await self.read_chunked()
+        elif "content-length" in headers:
+            content = await self.reader.readexactly(int(headers["content-length"]))
+        else:
+            content = await self.reader.read()
+            await self.close()
+        if headers.get("connection") == "close":
+            await self.close()
+        return status, content
+
+    async def read_chunked(self):
+        chunks = []
+        while True:
+            size = int((await self.reader.readline()).split(b";")[0], 16)
+            if size == 0:
+                break
+            chunks.append((await self.reader.readexactly(size + 2))[:-2])
+        # Trailers, up to the empty line ending the body.
+        while (await self.reader.readline()) not in (b"\r\n", b""):
+            pass
+        return b"".join(chunks)
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+
+class Command(BaseCommand):
+    help = (
+        "Load test a running Todo server with concurrent keep-alive clients "
+        "and report throughput and latency percentiles. Run it once against "
+        "the WSGI deployment with --path '/api/todo/?page_size=100' and once "
+        "against the ASGI deployment with --path "
+        "'/api/async/todo/?page_size=100' to compare them, e.g. gunicorn "
+        "core.wsgi vs uvicorn core.asgi:application, both started with "
+        "TODO_RESPONSE_CACHE=off so that the WSGI list is not served from the "
+        "response cache. Todos created with --write-ratio are deleted through "
+        "/api/todo/bulk/ afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("url", help="Base URL, e.g. http://127.0.0.1:8000")
+        parser.add_argument("--path", default="/api/todo/?page_size=100")
+        parser.add_argument("--concurrency", type=int, default=100)
+        parser.add_argument("--requests", type=int, default=5000)
+        parser.add_argument(
+            "--write-ratio",
+            type=float,
+            default=0.0,
+            help="Share of requests that create a todo instead of listing.",
+        )
+
+    def handle(self, *args, **options):
+        url = urlsplit(options["url"])
+        if url.scheme != "http" or not url.hostname:
+            raise CommandError("Only http:// URLs are supported.")
+
+        latencies, errors, elapsed, created = asyncio.run(
+            self.run(
+                url.hostname,
+                url.port or 80,
+                options["path"],
+                options["concurrency"],
+                options["requests"],
+                options["write_ratio"],
+            )
+        )
+        if created:
+            asyncio.run(self.delete(url.hostname, url.port or 80, created))
+        if not latencies:
+            raise CommandError("No request succeeded.")
+
+        latencies.sort()
+
+        def percentile(p):
+            return latencies[min(len(latencies) - 1, int(len(latencies) * p))]
+
+        self.stdout.write(
+            f"{len(latencies)} requests, {errors} errors in {elapsed:.2f}s\n"
+            f"throughput  {len(latencies) / elapsed:.0f} req/s\n"
+            f"mean        {statistics.fmean(latencies) * 1000:.1f}ms\n"
+            f"p50         {percentile(0.50) * 1000:.1f}ms\n"
+            f"p99         {percentile(0.99) * 1000:.1f}ms\n"
+            f"max         {latencies[-1] * 1000:.1f}ms"
+        )
+
+    async def run(self, host, port, path, concurrency, requests, write_ratio):
+        latencies = []
+        created = []
+        errors = 0
+        remaining = iter(range(requests))
+        body = json.dumps({"title": "load test", "text": "written by loadtest"})
+        write_every = round(1 / write_ratio) if write_ratio > 0 else 0
+
+        async def client():
+            nonlocal errors
+            connection = Connection(host, port)
+            try:
+                for number in remaining:
+                    write = write_every and number % write_every == 0
+                    start = time.perf_counter()
+                    try:
+                        if write:
+                            status, content = await connection.request(
+                                "POST", urlsplit(path).path, body.encode()
+                            )
+                        else:
+                            status, content = await connection.request("GET", path)
+                    except (OSError, EOFError, ValueError, IndexError):
+                        await connection.close()
+                        errors += 1
+                        continue
+                    if status >= 400:
+                        errors += 1
+                    else:
+                        latencies.append(time.perf_counter() - start)
+                        if write:
+                            created.append(json.loads(content)["id"])
+            finally:
+                await connection.close()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+        return latencies, errors, time.perf_counter() - start, created
+
+    async def delete(self, host, port, ids):
+        connection = Connection(host, port)
+        try:
+            for i in range(0, len(ids), 1000):
+                body = json.dumps({"ids": ids[i : i + 1000]}).encode()
+                status, _ = await connection.request("DELETE", "/api/todo/bulk/", body)
+                if status >= 400:
+                    raise CommandError(f"Deleting the created todos failed ({status}).")
+        finally:
+            await connection.close()
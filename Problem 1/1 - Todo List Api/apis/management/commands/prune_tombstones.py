@@ -0,0 +1,38 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from apis.models import ChangeCounter, TodoTombstone
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete the tombstones of todos deleted more than --days days ago. "
+        "Clients syncing from an older watermark get a 410 from the change "
+        "feed and have to start over from `since=0`."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=getattr(settings, "TODO_TOMBSTONE_RETENTION_DAYS", 30),
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options["days"])
+        with transaction.atomic():
+            tombstones = TodoTombstone.objects.filter(deleted_at__lt=cutoff)
+            last = tombstones.aggregate(Max("change_id"))["change_id__max"]
+            deleted = 0
+            if last is not None:
+                ChangeCounter.objects.get_or_create(pk=1)
+                ChangeCounter.objects.filter(pk=1, pruned__lt=last).update(
+                    pruned=last
+                )
+                deleted, _ = tombstones.filter(change_id__lte=last).delete()
+        self.stdout.write(f"Deleted {deleted} tombstones.")
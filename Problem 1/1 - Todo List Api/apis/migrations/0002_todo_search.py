@@ -0,0 +1,29 @@
+# Generated by Django 4.2.11 on 2026-10-18 13:26
+
+import apis.models
+from apis.search import create_search_index, drop_search_index
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apis', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TodoSearch',
+            fields=[
+                ('todo', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search', serialize=False, to='apis.todo')),
+                ('document', apis.models.FullTextField(db_column='apis_todo_fts')),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'apis_todo_fts',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.11 on 2026-10-18 14:02
+
+from apis.search import create_search_triggers
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apis', '0002_todo_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='todo',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, db_index=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='todo',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.CreateModel(
+            name='TodoTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('todo_id', models.BigIntegerField()),
+                ('deleted_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='todo',
+            index=models.Index(fields=['updated_at', 'id'], name='todo_updated_at_id_idx'),
+        ),
+        # SQLite rebuilds apis_todo to add the columns, which drops the
+        # full-text search triggers.
+        migrations.RunPython(create_search_triggers, migrations.RunPython.noop),
+    ]
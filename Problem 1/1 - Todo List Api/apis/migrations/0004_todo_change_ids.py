@@ -0,0 +1,79 @@
+# Generated by Django 4.2.11 on 2026-10-18 14:03
+
+import heapq
+
+from apis.search import create_search_triggers
+from django.db import migrations, models
+
+BATCH_SIZE = 2000
+
+
+def number_existing_changes(apps, schema_editor):
+    """Number the existing rows in the order the timestamp feed returned them."""
+    Todo = apps.get_model('apis', 'Todo')
+    TodoTombstone = apps.get_model('apis', 'TodoTombstone')
+    ChangeCounter = apps.get_model('apis', 'ChangeCounter')
+    # Both tables are streamed in feed order and merged, only a batch of
+    # rows is held in memory at a time.
+    rows = heapq.merge(
+        (
+            (todo.updated_at, 0, todo.id, todo)
+            for todo in Todo.objects.only('id', 'updated_at')
+            .order_by('updated_at', 'id')
+            .iterator(chunk_size=BATCH_SIZE)
+        ),
+        (
+            (tomb.deleted_at, 1, tomb.id, tomb)
+            for tomb in TodoTombstone.objects.only('id', 'deleted_at')
+            .order_by('deleted_at', 'id')
+            .iterator(chunk_size=BATCH_SIZE)
+        ),
+        key=lambda row: row[:3],
+    )
+    batches = {Todo: [], TodoTombstone: []}
+    change_id = 0
+    for change_id, (*_, obj) in enumerate(rows, start=1):
+        obj.change_id = change_id
+        batch = batches[type(obj)]
+        batch.append(obj)
+        if len(batch) == BATCH_SIZE:
+            type(obj).objects.bulk_update(batch, ['change_id'])
+            batch.clear()
+    for model, batch in batches.items():
+        model.objects.bulk_update(batch, ['change_id'])
+    ChangeCounter.objects.create(pk=1, value=change_id)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apis', '0003_todo_change_feed'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('value', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RemoveIndex(
+            model_name='todo',
+            name='todo_updated_at_id_idx',
+        ),
+        migrations.AddField(
+            model_name='todo',
+            name='change_id',
+            field=models.BigIntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='todotombstone',
+            name='change_id',
+            field=models.BigIntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.RunPython(number_existing_changes, migrations.RunPython.noop),
+        # SQLite rebuilds apis_todo to add the column, which drops the
+        # full-text search triggers.
+        migrations.RunPython(create_search_triggers, migrations.RunPython.noop),
+    ]
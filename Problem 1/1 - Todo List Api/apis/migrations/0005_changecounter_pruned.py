@@ -0,0 +1,18 @@
+# Generated by Django 4.2.11 on 2026-10-18 14:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apis', '0004_todo_change_ids'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='changecounter',
+            name='pruned',
+            field=models.BigIntegerField(default=0),
+        ),
+    ]
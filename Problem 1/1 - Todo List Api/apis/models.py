@@ -1,9 +1,132 @@
-from django.db import models
+from django.db import DEFAULT_DB_ALIAS, models, router, transaction
+from django.db.models import F
 
 
-class Todo(models.Model):
+class ChangeCounter(models.Model):
+    """
+    Single row handing out the change feed's `change_id`s.
+
+    Incrementing it locks the row until the writing transaction ends, so ids
+    are taken in commit order: a reader that has seen id N can never miss a
+    change numbered below N that commits later.
+    """
+
+    value = models.BigIntegerField(default=0)
+    # Highest `change_id` of the tombstones removed by `prune_tombstones`, a
+    # feed read from an older watermark may miss deletions.
+    pruned = models.BigIntegerField(default=0)
+
+    @classmethod
+    def get_pruned(cls, using=DEFAULT_DB_ALIAS):
+        pruned = cls.objects.using(using).filter(pk=1).values_list("pruned", flat=True)
+        return pruned.first() or 0
+
+
+def reserve_change_ids(count, using=DEFAULT_DB_ALIAS):
+    """Take the next `count` change ids, call inside the writing transaction."""
+    counter = ChangeCounter.objects.using(using).filter(pk=1)
+    if not counter.update(value=F("value") + count):
+        ChangeCounter.objects.using(using).get_or_create(pk=1)
+        counter.update(value=F("value") + count)
+    last = counter.values_list("value", flat=True).get()
+    return range(last - count + 1, last + 1)
+
+
+class ChangeQuerySet(models.QuerySet):
+    """Numbers the rows written by the bulk queries for the change feed."""
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        if not objs:
+            return objs
+        with transaction.atomic(using=self.db, savepoint=False):
+            for obj, change_id in zip(objs, reserve_change_ids(len(objs), self.db)):
+                obj.change_id = change_id
+            return super().bulk_create(objs, *args, **kwargs)
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        objs = list(objs)
+        if not objs:
+            return 0
+        with transaction.atomic(using=self.db, savepoint=False):
+            for obj, change_id in zip(objs, reserve_change_ids(len(objs), self.db)):
+                obj.change_id = change_id
+            return super().bulk_update(objs, [*fields, "change_id"], *args, **kwargs)
+
+
+class ChangeTracked(models.Model):
+    """
+    Rows reported by the `?since=` change feed, ordered by `change_id`.
+
+    Every write takes a fresh id from `ChangeCounter`, `QuerySet.update()`
+    and raw SQL bypass it and are not reported.
+    """
+
+    change_id = models.BigIntegerField(default=0, db_index=True, editable=False)
+
+    objects = ChangeQuerySet.as_manager()
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, using=None, update_fields=None, **kwargs):
+        using = using or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using, savepoint=False):
+            self.change_id = reserve_change_ids(1, using)[0]
+            if update_fields is not None:
+                update_fields = {*update_fields, "change_id"}
+            super().save(*args, using=using, update_fields=update_fields, **kwargs)
+
+
+class Todo(ChangeTracked):
     title = models.CharField(max_length=100)
     text = models.TextField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.title
+
+
+class TodoTombstone(ChangeTracked):
+    """Records a deleted todo so that the change feed can report it."""
+
+    todo_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+
+class FullTextField(models.TextField):
+    """The hidden FTS5 column that carries the table name, used for MATCH."""
+
+
+@FullTextField.register_lookup
+class Match(models.Lookup):
+    lookup_name = "match"
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} MATCH {rhs}", lhs_params + rhs_params
+
+
+class TodoSearch(models.Model):
+    """
+    SQLite FTS5 index over `Todo.title` and `Todo.text`.
+
+    The table and the triggers keeping it in sync are created by
+    `apis.search.create_search_index`, only on SQLite builds with FTS5.
+    """
+
+    todo = models.OneToOneField(
+        Todo,
+        on_delete=models.DO_NOTHING,
+        primary_key=True,
+        db_column="rowid",
+        related_name="search",
+    )
+    document = FullTextField(db_column="apis_todo_fts")
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = "apis_todo_fts"
@@ -0,0 +1,157 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections
+from django.utils.functional import cached_property
+from rest_framework.compat import coreapi, coreschema
+from rest_framework.pagination import CursorPagination
+
+COUNT_EXACT_THRESHOLD = getattr(settings, "TODO_COUNT_EXACT_THRESHOLD", 10000)
+COUNT_CACHE_TIMEOUT = getattr(settings, "TODO_COUNT_CACHE_TIMEOUT", 60)
+COUNT_KEY_PREFIX = "apis:count"
+PAGINATE_BY_DEFAULT = getattr(settings, "TODO_PAGINATE_BY_DEFAULT", False)
+
+
+def table_row_estimate(model, using):
+    """Row count of `model`'s table from the backend statistics, or None."""
+    connection = connections[using]
+    table = model._meta.db_table
+    try:
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                cursor.execute(
+                    "SELECT reltuples FROM pg_class WHERE oid = %s::regclass", [table]
+                )
+            elif connection.vendor == "sqlite":
+                # Written by ANALYZE, every row of a table starts with its
+                # number of rows.
+                cursor.execute(
+                    "SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1", [table]
+                )
+            else:
+                return None
+            row = cursor.fetchone()
+    except DatabaseError:
+        return None
+    if row is None or row[0] is None:
+        return None
+    estimate = int(str(row[0]).split()[0])
+    return estimate if estimate >= 0 else None
+
+
+def estimate_count(queryset, threshold=COUNT_EXACT_THRESHOLD):
+    """
+    Count `queryset` exactly when it has at most `threshold` rows, estimate
+    it otherwise.
+
+    The exact count is bounded by a LIMIT, so it never reads more than
+    `threshold + 1` rows. Larger results are taken from the table
+    statistics of the backend when the queryset is unfiltered, or counted
+    once and cached for TODO_COUNT_CACHE_TIMEOUT seconds.
+    """
+    queryset = queryset.order_by()
+    bounded = queryset[: threshold + 1].count()
+    if bounded <= threshold:
+        return bounded
+
+    if not queryset.query.where:
+        estimate = table_row_estimate(queryset.model, queryset.db)
+        if estimate is not None:
+            return max(estimate, bounded)
+
+    sql, params = queryset.query.sql_with_params()
+    digest = hashlib.sha1(f"{queryset.db} {sql} {params!r}".encode()).hexdigest()
+    key = f"{COUNT_KEY_PREFIX}:{digest}"
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, COUNT_CACHE_TIMEOUT)
+    return count
+
+
+class EstimatedCountPaginator(Paginator):
+    """`Paginator` counting its queryset with `estimate_count`."""
+
+    @cached_property
+    def count(self):
+        if not hasattr(self.object_list, "query"):
+            return super().count
+        return estimate_count(self.object_list)
+
+
+class ToDoCursorPagination(CursorPagination):
+    """
+    Keyset pagination over the primary key.
+
+    Each page is a single `WHERE id > <cursor> ORDER BY id LIMIT <size>` query,
+    so the cost does not grow with the page depth and rows inserted while a
+    client is paging never shift or duplicate entries. Full-text search
+    results are paged in rank order instead.
+
+    Pages carry no count unless `?count=true` is passed, the count is then
+    estimated with `estimate_count`.
+
+    Lists are only paginated when the request passes `cursor`, `page_size`
+    or `count`, other requests get the plain list of every todo unless
+    TODO_PAGINATE_BY_DEFAULT is set.
+    """
+
+    ordering = "id"
+    page_size = getattr(settings, "TODO_PAGE_SIZE", 100)
+    page_size_query_param = "page_size"
+    max_page_size = getattr(settings, "TODO_MAX_PAGE_SIZE", 1000)
+    count_query_param = "count"
+
+    count = None
+
+    def get_ordering(self, request, queryset, view):
+        if "rank" in queryset.query.annotations:
+            return ("rank", "id")
+        return super().get_ordering(request, queryset, view)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = (
+            self.cursor_query_param,
+            self.page_size_query_param,
+            self.count_query_param,
+        )
+        if not PAGINATE_BY_DEFAULT and not any(
+            name in request.query_params for name in params
+        ):
+            return None
+        value = request.query_params.get(self.count_query_param, "")
+        if value.lower() in ("1", "true"):
+            self.count = estimate_count(queryset)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        if self.count is not None:
+            response.data = {"count": self.count, **response.data}
+        return response
+
+    def get_schema_fields(self, view):
+        return super().get_schema_fields(view) + [
+            coreapi.Field(
+                name=self.count_query_param,
+                required=False,
+                location="query",
+                schema=coreschema.Boolean(
+                    title="Count",
+                    description="Include an estimated total count.",
+                ),
+            )
+        ]
+
+    def get_schema_operation_parameters(self, view):
+        return super().get_schema_operation_parameters(view) + [
+            {
+                "name": self.count_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Include an estimated total count.",
+                "schema": {"type": "boolean"},
+            }
+        ]
@@ -0,0 +1,164 @@
+import re
+
+from django.db import connections
+from django.db.models import F, Q
+from rest_framework.compat import coreapi, coreschema
+from rest_framework.filters import BaseFilterBackend
+
+FTS_TABLE = "apis_todo_fts"
+
+# Prefix indexes make `term*` queries of two and three characters and longer
+# an index range scan instead of a scan of the whole term dictionary.
+CREATE_FTS_TABLE = f"""
+    CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        title, text, content='apis_todo', content_rowid='id', prefix='2 3'
+    )
+"""
+CREATE_FTS_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert AFTER INSERT ON apis_todo BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, text)
+        VALUES (new.id, new.title, new.text);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete AFTER DELETE ON apis_todo BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, text)
+        VALUES ('delete', old.id, old.title, old.text);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update
+    AFTER UPDATE OF title, text ON apis_todo BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, text)
+        VALUES ('delete', old.id, old.title, old.text);
+        INSERT INTO {FTS_TABLE}(rowid, title, text)
+        VALUES (new.id, new.title, new.text);
+    END
+    """,
+]
+
+# Words of the search query, a trailing `*` asks for a prefix match.
+SEARCH_TERM_RE = re.compile(r"\w+\*?")
+
+_fts_available = {}
+
+
+def _supports_fts(connection):
+    if connection.vendor != "sqlite":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA compile_options")
+        return ("ENABLE_FTS5",) in cursor.fetchall()
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if not _supports_fts(connection):
+        return  # Searches fall back to LIKE scans.
+    schema_editor.execute(CREATE_FTS_TABLE)
+    create_search_triggers(apps, schema_editor)
+    schema_editor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def create_search_triggers(apps, schema_editor):
+    """
+    (Re)create the sync triggers, SQLite drops them whenever a migration
+    rebuilds the `apis_todo` table.
+    """
+    connection = schema_editor.connection
+    if FTS_TABLE not in connection.introspection.table_names():
+        return
+    for sql in CREATE_FTS_TRIGGERS:
+        schema_editor.execute(sql)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for suffix in ("insert", "delete", "update"):
+        schema_editor.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}")
+    schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+def fts_available(using):
+    if using not in _fts_available:
+        connection = connections[using]
+        _fts_available[using] = (
+            connection.vendor == "sqlite"
+            and FTS_TABLE in connection.introspection.table_names()
+        )
+    return _fts_available[using]
+
+
+def search_todos(queryset, query):
+    """
+    Filter a Todo queryset down to rows matching every word of `query`.
+
+    On SQLite the match runs against the FTS5 index and rows are annotated
+    with their bm25 `rank` (lower is better), other backends fall back to
+    `icontains` filters.
+    """
+    terms = SEARCH_TERM_RE.findall(query)
+    if not terms:
+        return queryset.none()
+
+    if fts_available(queryset.db):
+        # Quote every word so that user input is never parsed as FTS5 syntax.
+        match = " ".join(
+            f'"{term[:-1]}"*' if term.endswith("*") else f'"{term}"'
+            for term in terms
+        )
+        return queryset.filter(search__document__match=match).annotate(
+            rank=F("search__rank")
+        )
+
+    for term in terms:
+        term = term.rstrip("*")
+        queryset = queryset.filter(Q(title__icontains=term) | Q(text__icontains=term))
+    return queryset
+
+
+class ToDoSearchFilter(BaseFilterBackend):
+    """Full-text search on title and text with `?q=`."""
+
+    search_param = "q"
+    search_description = (
+        "Words that must all appear in the title or text, "
+        "end a word with `*` to match it as a prefix."
+    )
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, "")
+        if not query.strip():
+            return queryset
+        todos = search_todos(queryset, query)
+        # Unpaginated lists are not ordered by `ToDoCursorPagination`.
+        if "rank" in todos.query.annotations:
+            todos = todos.order_by("rank", "id")
+        return todos
+
+    def get_schema_fields(self, view):
+        assert coreapi is not None, "coreapi must be installed for schema fields"
+        assert coreschema is not None, "coreschema must be installed for schema fields"
+        return [
+            coreapi.Field(
+                name=self.search_param,
+                required=False,
+                location="query",
+                schema=coreschema.String(
+                    title="Search", description=self.search_description
+                ),
+            )
+        ]
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.search_param,
+                "required": False,
+                "in": "query",
+                "description": self.search_description,
+                "schema": {"type": "string"},
+            }
+        ]
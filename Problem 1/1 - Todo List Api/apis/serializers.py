@@ -1,9 +1,92 @@
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
 from rest_framework import serializers
 
+from apis.cache import bump_version
 from apis.models import Todo
 
+BULK_MAX_ITEMS = getattr(settings, "TODO_BULK_MAX_ITEMS", 10000)
+
+
+class ToDoListSerializer(serializers.ListSerializer):
+    """
+    Saves a whole list of todos with one `bulk_create` / `bulk_update` call
+    instead of one `save()` per item.
+
+    Bulk queries do not send model signals, so the response cache version is
+    bumped here.
+    """
+
+    def create(self, validated_data):
+        todos = [Todo(**attrs) for attrs in validated_data]
+        todos = Todo.objects.bulk_create(todos)
+        transaction.on_commit(bump_version)
+        return todos
+
+    def update(self, instance, validated_data):
+        # `instance` is the `{id: Todo}` mapping of the rows being updated.
+        todos = {}
+        fields = set()
+        now = timezone.now()
+        for attrs in validated_data:
+            todo = instance[attrs.pop("id")]
+            for attr, value in attrs.items():
+                setattr(todo, attr, value)
+            todo.updated_at = now  # `auto_now` is not applied by bulk_update.
+            fields.update(attrs)
+            todos[todo.id] = todo
+
+        if fields:
+            Todo.objects.bulk_update(todos.values(), fields | {"updated_at"})
+            transaction.on_commit(bump_version)
+        return list(todos.values())
+
 
 class ToDoSerializer(serializers.ModelSerializer):
+    def __init__(self, *args, **kwargs):
+        # Only render the given field names when `fields` is passed.
+        fields = kwargs.pop("fields", None)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
     class Meta:
         model = Todo
         fields = "__all__"
+        list_serializer_class = ToDoListSerializer
+
+
+class ToDoBulkUpdateSerializer(ToDoSerializer):
+    id = serializers.IntegerField()
+
+    def validate_id(self, value):
+        if value not in self.parent.instance:
+            raise serializers.ValidationError(f"Todo {value} does not exist.")
+        return value
+
+    def validate(self, attrs):
+        # Partial updates skip the required check of every field.
+        if "id" not in attrs:
+            raise serializers.ValidationError(
+                {"id": [self.fields["id"].error_messages["required"]]}
+            )
+        return super().validate(attrs)
+
+
+class ToDoBulkDeleteSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=BULK_MAX_ITEMS,
+    )
+
+
+class ToDoChangesQuerySerializer(serializers.Serializer):
+    since = serializers.IntegerField(required=False, min_value=0, default=0)
+    limit = serializers.IntegerField(
+        required=False,
+        min_value=1,
+        max_value=getattr(settings, "TODO_MAX_PAGE_SIZE", 1000),
+    )
@@ -0,0 +1,26 @@
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apis.cache import bump_version
+from apis.db import configure_sqlite
+from apis.models import Todo, TodoTombstone
+
+
+@receiver(post_save, sender=Todo)
+@receiver(post_delete, sender=Todo)
+def todo_changed(sender, **kwargs):
+    # Bump after commit, a reader racing the write would otherwise cache the
+    # old rows under the new version.
+    transaction.on_commit(bump_version)
+
+
+@receiver(post_delete, sender=Todo)
+def todo_deleted(sender, instance, **kwargs):
+    TodoTombstone.objects.create(todo_id=instance.id)
+
+
+@receiver(connection_created)
+def connection_opened(sender, connection, **kwargs):
+    configure_sqlite(connection)
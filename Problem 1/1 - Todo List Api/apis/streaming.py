@@ -0,0 +1,190 @@
+import csv
+import json
+import re
+
+from django.conf import settings
+from django.db import transaction
+from rest_framework.utils.encoders import JSONEncoder
+
+from apis.cache import bump_version
+from apis.models import Todo
+from apis.serializers import ToDoSerializer
+
+EXPORT_FIELDS = ("id", "title", "text", "created_at", "updated_at")
+CHUNK_SIZE = getattr(settings, "TODO_STREAM_CHUNK_SIZE", 2000)
+
+# Only the first errors are reported back, an import of a broken file
+# must not build an error list as large as the file itself.
+MAX_REPORTED_ERRORS = 100
+
+# CSV has no null, it is written as \N like in PostgreSQL and MySQL dumps.
+# Text made only of backslashes and a final "N" gets one more backslash, so
+# that it is not read back as null.
+CSV_NULL = "\\N"
+CSV_ESCAPED_RE = re.compile(r"\\+N")
+
+CONTENT_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+class _Echo:
+    """File-like object handing back what `csv.writer` writes to it."""
+
+    def write(self, value):
+        return value
+
+
+def _iter_rows(queryset, chunk_size):
+    return (
+        queryset.order_by("id")
+        .values_list(*EXPORT_FIELDS)
+        .iterator(chunk_size=chunk_size)
+    )
+
+
+def _batched(lines, chunk_size):
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= chunk_size:
+            yield "".join(batch)
+            batch = []
+    if batch:
+        yield "".join(batch)
+
+
+def export_ndjson(queryset, chunk_size=CHUNK_SIZE):
+    """Yield the todos of `queryset` as NDJSON, one chunk of lines at a time."""
+    encoder = JSONEncoder(ensure_ascii=False)
+    lines = (
+        encoder.encode(dict(zip(EXPORT_FIELDS, row))) + "\n"
+        for row in _iter_rows(queryset, chunk_size)
+    )
+    return _batched(lines, chunk_size)
+
+
+def export_csv(queryset, chunk_size=CHUNK_SIZE):
+    """Yield the todos of `queryset` as CSV with a header line, nulls as `\\N`."""
+    writer = csv.writer(_Echo())
+    lines = (
+        writer.writerow(_to_csv(value) for value in row)
+        for row in _iter_rows(queryset, chunk_size)
+    )
+    yield writer.writerow(EXPORT_FIELDS)
+    yield from _batched(lines, chunk_size)
+
+
+def _to_csv(value):
+    if value is None:
+        return CSV_NULL
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if isinstance(value, str) and CSV_ESCAPED_RE.fullmatch(value):
+        return "\\" + value
+    return value
+
+
+def _from_csv(value):
+    if value == CSV_NULL:
+        return None
+    if isinstance(value, str) and CSV_ESCAPED_RE.fullmatch(value):
+        return value[1:]
+    return value
+
+
+class UndecodableLine(str):
+    """Stands in for a line that is not UTF-8, it reads as an empty line."""
+
+
+def decode_lines(stream):
+    """Yield the UTF-8 lines of a binary `stream`, invalid ones as `UndecodableLine`."""
+    for line in iter(stream.readline, b""):
+        try:
+            yield line.decode("utf-8")
+        except UnicodeDecodeError:
+            yield UndecodableLine("\n")
+
+
+def read_ndjson(lines):
+    """Parse NDJSON text lines into `(line_number, data)` pairs."""
+    for line_number, line in enumerate(lines, start=1):
+        if isinstance(line, UndecodableLine):
+            yield line_number, line
+            continue
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError:
+            data = None
+        yield line_number, data
+
+
+def read_csv(lines):
+    """Parse CSV text lines with a header into `(line_number, data)` pairs."""
+    undecodable = []
+
+    def numbered():
+        # The reader skips them as empty lines, they are reported in order
+        # before the next row.
+        for line_number, line in enumerate(lines, start=1):
+            if isinstance(line, UndecodableLine):
+                undecodable.append((line_number, line))
+            yield line
+
+    reader = csv.DictReader(numbered())
+    for data in reader:
+        yield from _drain(undecodable)
+        yield reader.line_num, {key: _from_csv(value) for key, value in data.items()}
+    yield from _drain(undecodable)
+
+
+def _drain(items):
+    while items:
+        yield items.pop(0)
+
+
+def import_todos(rows, chunk_size=CHUNK_SIZE):
+    """
+    Validate `(line_number, data)` pairs with `ToDoSerializer` and insert the
+    valid ones with one `bulk_create` transaction per `chunk_size` rows.
+
+    Only `title` and `text` are imported, rows get new ids and timestamps.
+    """
+    result = {"created": 0, "failed": 0, "errors": []}
+    batch = []
+    for line_number, data in rows:
+        if isinstance(data, UndecodableLine):
+            errors = {"non_field_errors": ["Line is not valid UTF-8."]}
+        elif not isinstance(data, dict):
+            errors = {"non_field_errors": ["Invalid JSON object."]}
+        else:
+            serializer = ToDoSerializer(data=data)
+            if serializer.is_valid():
+                batch.append(Todo(**serializer.validated_data))
+                if len(batch) >= chunk_size:
+                    result["created"] += _insert(batch)
+                    batch = []
+                continue
+            errors = serializer.errors
+
+        result["failed"] += 1
+        if len(result["errors"]) < MAX_REPORTED_ERRORS:
+            result["errors"].append({"line": line_number, "errors": errors})
+
+    if batch:
+        result["created"] += _insert(batch)
+    return result
+
+
+def _insert(todos):
+    with transaction.atomic():
+        Todo.objects.bulk_create(todos)
+        transaction.on_commit(bump_version)
+    return len(todos)
+
+
+EXPORTERS = {"ndjson": export_ndjson, "csv": export_csv}
+READERS = {"ndjson": read_ndjson, "csv": read_csv}
@@ -1,3 +1,989 @@
-from django.test import TestCase
+import asyncio
+import csv
+import io
+import json
+import math
+import os
+import subprocess
+import sys
+from concurrent.futures import Future
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.utils import timezone
+from django.db import IntegrityError, connection, connections
+from django.conf import settings
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import clear_url_caches
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient, APITestCase
+
+from apis import streaming
+from apis.batching import BatchWriter
+from apis.fastpath import ReadPlan
+from apis.management.commands.importtime_report import (
+    STARTUP_SCRIPT,
+    parse_importtime,
+)
+from apis.management.commands.loadtest import Connection
+from apis.models import ChangeCounter, Todo, TodoTombstone
+from apis.pagination import ToDoCursorPagination, estimate_count
+from apis.renderers import FastJSONRenderer
+from core import schema
+
+
+class ToDoAPITestCase(APITestCase):
+    def setUp(self):
+        # Test transactions never commit, so the response cache version is
+        # not bumped between tests.
+        cache.clear()
+
+
+class ToDoPaginationTests(ToDoAPITestCase):
+    def setUp(self):
+        super().setUp()
+        Todo.objects.bulk_create(Todo(title=f"todo {i}") for i in range(5))
+
+    def test_pages_follow_primary_key(self):
+        ids = []
+        url = "/api/todo/?page_size=2"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data["results"]), 2)
+            ids += [item["id"] for item in response.data["results"]]
+            url = response.data["next"]
+
+        self.assertEqual(ids, list(Todo.objects.order_by("id").values_list("id", flat=True)))
+
+    def test_page_size_is_capped(self):
+        with mock.patch.object(ToDoCursorPagination, "max_page_size", 3):
+            response = self.client.get("/api/todo/?page_size=50")
+
+        self.assertEqual(len(response.data["results"]), 3)
+        self.assertIsNotNone(response.data["next"])
+
+    def test_rows_inserted_while_paging_are_not_repeated(self):
+        first = self.client.get("/api/todo/?page_size=2")
+        Todo.objects.create(title="late todo")
+        second = self.client.get(first.data["next"])
+
+        first_ids = {item["id"] for item in first.data["results"]}
+        second_ids = {item["id"] for item in second.data["results"]}
+        self.assertFalse(first_ids & second_ids)
+
+    def test_plain_list_without_pagination_params(self):
+        response = self.client.get("/api/todo/")
+
+        self.assertEqual(
+            [item["id"] for item in response.data],
+            list(Todo.objects.order_by("id").values_list("id", flat=True)),
+        )
+
+        # A different query string, the plain list above is cached.
+        with mock.patch("apis.pagination.PAGINATE_BY_DEFAULT", True):
+            response = self.client.get("/api/todo/", {"fields": "id"})
+        self.assertEqual(len(response.data["results"]), 5)
+
+    def test_count_is_opt_in(self):
+        response = self.client.get("/api/todo/?page_size=2")
+        self.assertNotIn("count", response.data)
+
+        response = self.client.get("/api/todo/?page_size=2&count=true")
+        self.assertEqual(response.data["count"], 5)
+        self.assertEqual(len(response.data["results"]), 2)
+
+
+class EstimatedCountTests(ToDoAPITestCase):
+    def setUp(self):
+        super().setUp()
+        Todo.objects.bulk_create(Todo(title=f"todo {i}") for i in range(5))
+
+    def test_exact_below_threshold(self):
+        self.assertEqual(estimate_count(Todo.objects.all(), threshold=5), 5)
+
+    def test_cached_above_threshold(self):
+        queryset = Todo.objects.filter(title__startswith="todo")
+        self.assertEqual(estimate_count(queryset, threshold=2), 5)
+
+        Todo.objects.create(title="todo 5")
+
+        self.assertEqual(estimate_count(queryset, threshold=2), 5)
+        self.assertEqual(estimate_count(queryset, threshold=10), 6)
+
+    def test_table_statistics_above_threshold(self):
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+        Todo.objects.create(title="not analyzed yet")
+
+        self.assertEqual(estimate_count(Todo.objects.all(), threshold=2), 5)
+
+    def test_admin_changelist(self):
+        user = User.objects.create_superuser("admin", "admin@example.com", "pw")
+        self.client.force_login(user)
+
+        with mock.patch(
+            "apis.pagination.estimate_count", wraps=estimate_count
+        ) as estimate:
+            response = self.client.get("/admin/apis/todo/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(estimate.call_count, 1)
+        self.assertContains(response, "5 todos")
+
+
+class ToDoBulkTests(ToDoAPITestCase):
+    url = "/api/todo/bulk/"
+
+    def test_bulk_create(self):
+        payload = [{"title": f"todo {i}", "text": "text"} for i in range(20)]
+
+        # savepoint, change id UPDATE + SELECT, INSERT, release
+        with self.assertNumQueries(5):
+            response = self.client.post(self.url, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data), 20)
+        self.assertTrue(all(item["id"] for item in response.data))
+        self.assertEqual(Todo.objects.count(), 20)
+
+    def test_bulk_create_reports_errors_per_item(self):
+        payload = [{"title": "ok"}, {"text": "missing title"}]
+
+        response = self.client.post(self.url, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertIn("title", response.data[1])
+        self.assertFalse(Todo.objects.exists())
+
+    def test_bulk_update(self):
+        first, second = Todo.objects.bulk_create(
+            [Todo(title="first"), Todo(title="second")]
+        )
+        payload = [{"id": first.id, "title": "1st"}, {"id": second.id, "text": "note"}]
+
+        response = self.client.patch(self.url, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.title, "1st")
+        self.assertEqual((second.title, second.text), ("second", "note"))
+
+    def test_bulk_update_unknown_id(self):
+        todo = Todo.objects.create(title="todo")
+        payload = [{"id": todo.id, "title": "changed"}, {"id": todo.id + 1, "title": "x"}]
+
+        response = self.client.patch(self.url, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("id", response.data[1])
+        todo.refresh_from_db()
+        self.assertEqual(todo.title, "todo")
+
+    def test_bulk_update_invalid_ids(self):
+        todo = Todo.objects.create(title="todo")
+        payload = [
+            {"id": float(todo.id), "title": "changed"},
+            {"id": "²", "title": "x"},
+            {"title": "no id"},
+            "not an object",
+        ]
+
+        response = self.client.patch(self.url, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertIn("id", response.data[1])
+        self.assertIn("id", response.data[2])
+        self.assertIn("non_field_errors", response.data[3])
+
+    def test_bulk_delete(self):
+        todos = Todo.objects.bulk_create(Todo(title=f"todo {i}") for i in range(3))
+        ids = [todos[0].id, todos[1].id, 9999]
+
+        # savepoint, SELECT ids, SELECT rows, DELETE, change id UPDATE + SELECT
+        # and INSERT of each tombstone, release
+        with self.assertNumQueries(11):
+            response = self.client.delete(self.url, {"ids": ids}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["deleted"], ids[:2])
+        self.assertEqual(response.data["not_found"], [9999])
+        self.assertEqual(list(Todo.objects.values_list("id", flat=True)), [todos[2].id])
+        self.assertCountEqual(
+            TodoTombstone.objects.values_list("todo_id", flat=True), ids[:2]
+        )
+
+
+class ToDoResponseCacheTests(ToDoAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.todo = Todo.objects.create(title="todo")
+        self.url = f"/api/todo/{self.todo.id}/"
+
+    def test_unchanged_data_is_not_modified(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_cache_hit_skips_database(self):
+        first = self.client.get("/api/todo/")
+
+        with self.assertNumQueries(0):
+            second = self.client.get("/api/todo/")
+
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second["ETag"], first["ETag"])
+
+    def test_write_invalidates_cache(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(self.url, {"title": "changed"}, format="json")
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["title"], "changed")
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_pages_of_users_are_not_cached(self):
+        alice = User.objects.create_superuser("alice", "alice@example.com", "pw")
+        self.client.force_login(alice)
+        page = self.client.get("/api/todo/", HTTP_ACCEPT="text/html")
+        self.assertContains(page, "alice")
+        json_response = self.client.get("/api/todo/")
+        self.assertNotIn("ETag", json_response)
+        self.client.logout()
+
+        response = self.client.get("/api/todo/", HTTP_ACCEPT="text/html")
+        self.assertNotContains(response, "alice")
+
+        self.assertIn("Cookie", self.client.get("/api/todo/")["Vary"])
+
+    @override_settings(TODO_RESPONSE_CACHE=False)
+    def test_cache_can_be_turned_off(self):
+        self.client.get("/api/todo/")
+
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/todo/")
+
+        self.assertNotIn("ETag", response)
+
+    def test_local_cache_keeps_entries_briefly(self):
+        with mock.patch.object(cache, "set", wraps=cache.set) as cache_set:
+            self.client.get("/api/todo/")
+
+        self.assertEqual(cache_set.call_args.args[2], 5)
+
+    def test_bulk_write_invalidates_cache(self):
+        self.client.get("/api/todo/")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post("/api/todo/bulk/", [{"title": "new"}], format="json")
+        response = self.client.get("/api/todo/")
+
+        self.assertEqual(len(response.json()), 2)
+
+
+class ToDoSearchTests(ToDoAPITestCase):
+    def setUp(self):
+        super().setUp()
+        Todo.objects.bulk_create(
+            [
+                Todo(title="buy milk", text="from the corner shop"),
+                Todo(title="walk the dog"),
+                Todo(title="milkshake", text="milk milk milk"),
+                Todo(title="call mum", text="about the dog"),
+            ]
+        )
+
+    def search(self, query):
+        response = self.client.get("/api/todo/", {"q": query})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [item["title"] for item in response.data]
+
+    def test_search_matches_title_and_text(self):
+        self.assertCountEqual(self.search("dog"), ["walk the dog", "call mum"])
+
+    def test_search_requires_every_word(self):
+        self.assertEqual(self.search("dog walk"), ["walk the dog"])
+
+    def test_prefix_search(self):
+        self.assertEqual(self.search("milk"), ["milkshake", "buy milk"])
+        self.assertCountEqual(self.search("mil*"), ["milkshake", "buy milk"])
+
+    def test_ranked_results_page_with_cursor(self):
+        titles = []
+        response = self.client.get("/api/todo/", {"q": "the", "page_size": 1})
+        while True:
+            titles += [item["title"] for item in response.data["results"]]
+            if not response.data["next"]:
+                break
+            response = self.client.get(response.data["next"])
+
+        self.assertCountEqual(titles, ["buy milk", "walk the dog", "call mum"])
+
+    def test_index_follows_updates_and_deletes(self):
+        todo = Todo.objects.get(title="walk the dog")
+        todo.title = "walk the cat"
+        todo.save()
+        Todo.objects.filter(title="call mum").delete()
+
+        self.assertEqual(self.search("dog"), [])
+        self.assertEqual(self.search("cat"), ["walk the cat"])
+
+    def test_search_syntax_is_not_interpreted(self):
+        self.assertEqual(self.search('milk" OR "dog'), [])
+
+    def test_fallback_without_fts(self):
+        with mock.patch("apis.search.fts_available", return_value=False):
+            self.assertCountEqual(self.search("dog"), ["walk the dog", "call mum"])
+            self.assertCountEqual(self.search("mil*"), ["milkshake", "buy milk"])
+
+
+class ToDoChangesTests(ToDoAPITestCase):
+    url = "/api/todo/changes/"
+
+    def test_first_sync_returns_everything(self):
+        Todo.objects.bulk_create(Todo(title=f"todo {i}") for i in range(3))
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["changed"]), 3)
+        self.assertEqual(response.data["deleted"], [])
+        self.assertFalse(response.data["has_more"])
+        self.assertIsNotNone(response.data["watermark"])
+
+    def test_only_changes_after_watermark(self):
+        kept, updated, deleted = Todo.objects.bulk_create(
+            Todo(title=f"todo {i}") for i in range(3)
+        )
+        watermark = self.client.get(self.url).data["watermark"]
+
+        updated.title = "updated"
+        updated.save()
+        deleted_id = deleted.id
+        deleted.delete()
+        created = Todo.objects.create(title="created")
+        response = self.client.get(self.url, {"since": watermark})
+
+        self.assertEqual(
+            [item["id"] for item in response.data["changed"]], [updated.id, created.id]
+        )
+        self.assertEqual(response.data["deleted"], [deleted_id])
+        self.assertGreater(response.data["watermark"], watermark)
+
+        response = self.client.get(self.url, {"since": response.data["watermark"]})
+        self.assertEqual((response.data["changed"], response.data["deleted"]), ([], []))
+
+    def test_bulk_update_moves_watermark(self):
+        todo = Todo.objects.create(title="todo")
+        watermark = self.client.get(self.url).data["watermark"]
+
+        self.client.patch(
+            "/api/todo/bulk/", [{"id": todo.id, "title": "bulk"}], format="json"
+        )
+        response = self.client.get(self.url, {"since": watermark})
+
+        self.assertEqual([item["title"] for item in response.data["changed"]], ["bulk"])
+
+    def test_limit_pages_through_changes(self):
+        Todo.objects.bulk_create(Todo(title=f"todo {i}") for i in range(5))
+
+        ids, since, has_more = [], None, True
+        while has_more:
+            params = {"limit": 2, **({"since": since} if since else {})}
+            response = self.client.get(self.url, params)
+            ids += [item["id"] for item in response.data["changed"]]
+            since, has_more = response.data["watermark"], response.data["has_more"]
+
+        self.assertCountEqual(ids, Todo.objects.values_list("id", flat=True))
+
+    def test_limit_pages_through_deletes(self):
+        todos = Todo.objects.bulk_create(Todo(title=f"todo {i}") for i in range(4))
+        ids = [todo.id for todo in todos]
+        since = self.client.get(self.url).data["watermark"]
+        for todo in todos[:3]:
+            todo.delete()
+        todos[3].save()
+
+        response = self.client.get(self.url, {"since": since, "limit": 2})
+        self.assertEqual(response.data["deleted"], ids[:2])
+        self.assertEqual(response.data["changed"], [])
+        self.assertTrue(response.data["has_more"])
+
+        response = self.client.get(
+            self.url, {"since": response.data["watermark"], "limit": 2}
+        )
+        self.assertEqual(response.data["deleted"], [ids[2]])
+        self.assertEqual([item["id"] for item in response.data["changed"]], [ids[3]])
+        self.assertFalse(response.data["has_more"])
+
+    def test_change_ids_follow_commit_order(self):
+        todo = Todo.objects.create(title="todo")
+        first = todo.change_id
+        Todo.objects.create(title="other")
+        todo.save(update_fields=["title"])
+
+        todo.refresh_from_db()
+        self.assertGreater(todo.change_id, first)
+        self.assertEqual(
+            ChangeCounter.objects.get().value,
+            max(Todo.objects.values_list("change_id", flat=True)),
+        )
+
+    def test_pruned_tombstones_expire_old_watermarks(self):
+        old, recent = Todo.objects.bulk_create(
+            Todo(title=f"todo {i}") for i in range(2)
+        )
+        recent_id = recent.id
+        since = self.client.get(self.url).data["watermark"]
+        old.delete()
+        TodoTombstone.objects.update(deleted_at=timezone.now() - timedelta(days=31))
+        recent.delete()
+
+        call_command("prune_tombstones", days=30, stdout=io.StringIO())
+
+        self.assertEqual(TodoTombstone.objects.count(), 1)
+        response = self.client.get(self.url, {"since": since})
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+        watermark = ChangeCounter.objects.get().pruned
+        response = self.client.get(self.url, {"since": watermark})
+        self.assertEqual(response.data["deleted"], [recent_id])
+
+    def test_invalid_watermark(self):
+        response = self.client.get(self.url, {"since": "yesterday"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("since", response.data)
+
+
+class ToDoStreamingTests(ToDoAPITestCase):
+    def setUp(self):
+        super().setUp()
+        Todo.objects.bulk_create(
+            [Todo(title="first", text='quoted "text", with comma'), Todo(title="second")]
+        )
+
+    def test_export_ndjson(self):
+        response = self.client.get("/api/todo/export/ndjson/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        content = b"".join(response.streaming_content)
+        rows = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual([row["title"] for row in rows], ["first", "second"])
+        self.assertIsNone(rows[1]["text"])
+
+    def test_export_csv(self):
+        response = self.client.get("/api/todo/export/csv/")
+
+        content = b"".join(response.streaming_content).decode()
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual(rows[0]["text"], 'quoted "text", with comma')
+        self.assertEqual(rows[1]["title"], "second")
+
+    def test_export_import_roundtrip(self):
+        exports = {
+            file_format: b"".join(
+                self.client.get(f"/api/todo/export/{file_format}/").streaming_content
+            )
+            for file_format in streaming.CONTENT_TYPES
+        }
+
+        for file_format, body in exports.items():
+            with self.subTest(file_format):
+                response = self.client.post(
+                    f"/api/todo/import/{file_format}/",
+                    body,
+                    content_type=streaming.CONTENT_TYPES[file_format],
+                )
+
+                self.assertEqual(response.data["created"], 2)
+                self.assertEqual(response.data["failed"], 0)
+
+        self.assertEqual(Todo.objects.filter(title="first").count(), 3)
+        self.assertEqual(
+            list(Todo.objects.filter(title="second").values_list("text", flat=True)),
+            [None, None, None],
+        )
+
+    def test_csv_null_marker(self):
+        Todo.objects.all().delete()
+        Todo.objects.bulk_create(
+            Todo(title=title, text=text)
+            for title, text in (("null", None), ("empty", ""), ("marker", "\\N"))
+        )
+        body = b"".join(self.client.get("/api/todo/export/csv/").streaming_content)
+        self.assertIn(b"null,\\N,", body)
+        self.assertIn(b"marker,\\\\N,", body)
+        Todo.objects.all().delete()
+
+        self.client.post("/api/todo/import/csv/", body, content_type="text/csv")
+
+        self.assertEqual(
+            dict(Todo.objects.values_list("title", "text")),
+            {"null": None, "empty": "", "marker": "\\N"},
+        )
+
+    def test_import_reports_bad_lines(self):
+        body = b'{"title": "ok"}\nnot json\n\n{"text": "no title"}\n'
+
+        response = self.client.post(
+            "/api/todo/import/ndjson/", body, content_type="application/x-ndjson"
+        )
+
+        self.assertEqual(response.data["created"], 1)
+        self.assertEqual(response.data["failed"], 2)
+        self.assertEqual([error["line"] for error in response.data["errors"]], [2, 4])
+
+    def test_import_reports_invalid_utf8_lines(self):
+        bodies = {
+            "ndjson": b'{"title": "ok"}\n{"title": "caf\xe9"}\n\xff\n{"title": "ok"}\n',
+            "csv": b"title,text\nok,\ncaf\xe9,\n\xff\nok,\n",
+        }
+
+        for file_format, body in bodies.items():
+            with self.subTest(file_format):
+                response = self.client.post(
+                    f"/api/todo/import/{file_format}/",
+                    body,
+                    content_type=streaming.CONTENT_TYPES[file_format],
+                )
+
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(response.data["created"], 2)
+                self.assertEqual(response.data["failed"], 2)
+                lines = [error["line"] for error in response.data["errors"]]
+                self.assertEqual(lines, [2, 3] if file_format == "ndjson" else [3, 4])
+
+    def test_import_commits_in_chunks(self):
+        rows = [(number, {"title": f"todo {number}"}) for number in range(1, 6)]
+
+        with mock.patch.object(Todo.objects, "bulk_create") as bulk_create:
+            result = streaming.import_todos(rows, chunk_size=2)
+
+        self.assertEqual(result["created"], 5)
+        sizes = [len(call.args[0]) for call in bulk_create.call_args_list]
+        self.assertEqual(sizes, [2, 2, 1])
+
+
+class ToDoFieldsetTests(ToDoAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.todo = Todo.objects.create(title="todo", text="a long text")
+
+    def test_fields_trims_list_and_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/todo/", {"fields": "id,title"})
+
+        self.assertEqual(response.data, [{"id": self.todo.id, "title": "todo"}])
+        self.assertNotIn('"text"', queries[-1]["sql"])
+
+    def test_exclude_on_retrieve(self):
+        response = self.client.get(f"/api/todo/{self.todo.id}/", {"exclude": "text"})
+
+        self.assertNotIn("text", response.data)
+        self.assertEqual(response.data["title"], "todo")
+
+    def test_unknown_field(self):
+        response = self.client.get("/api/todo/", {"fields": "title,secret"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("fields", response.data)
+
+    def test_writes_ignore_fieldsets(self):
+        response = self.client.patch(
+            f"/api/todo/{self.todo.id}/?fields=id", {"title": "new"}, format="json"
+        )
+
+        self.assertEqual(response.data["title"], "new")
+        self.assertEqual(response.data["text"], "a long text")
+
+
+class ToDoFastReadPathTests(ToDoAPITestCase):
+    def setUp(self):
+        super().setUp()
+        Todo.objects.bulk_create(
+            [
+                Todo(title="first", text="line\u2028separator"),
+                Todo(title="ทดสอบ", text=None),
+                Todo(title="third", text='"quoted"'),
+            ]
+        )
+
+    def get_both(self, url):
+        fast = self.client.get(url)
+        cache.clear()
+        with mock.patch("apis.fastpath.FAST_READ_PATH", False):
+            slow = self.client.get(url)
+        return fast, slow
+
+    def test_same_response_as_serializer(self):
+        for url in (
+            "/api/todo/",
+            "/api/todo/?page_size=2",
+            "/api/todo/?fields=title,updated_at",
+            "/api/todo/?q=third",
+        ):
+            with self.subTest(url):
+                fast, slow = self.get_both(url)
+                self.assertEqual(fast.status_code, status.HTTP_200_OK)
+                self.assertEqual(fast.content, slow.content)
+
+    def test_plan_is_compiled_once_per_field_set(self):
+        with mock.patch.object(
+            ReadPlan, "compile", wraps=ReadPlan.compile
+        ) as compile_plan, mock.patch.dict("apis.fastpath._READ_PLANS", clear=True):
+            for url in ("/api/todo/", "/api/todo/?fields=title") * 2:
+                cache.clear()
+                self.client.get(url)
+
+        self.assertEqual(compile_plan.call_count, 2)
+
+    def test_renderer_output_matches_json_renderer(self):
+        data = {
+            "list": [1, 2.5, None, True, "ทดสอบ\u2029"],
+            "nested": {"at": timezone.now(), "date": timezone.now().date()},
+        }
+
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(
+            FastJSONRenderer().render(data, "application/json; indent=2"),
+            JSONRenderer().render(data, "application/json; indent=2"),
+        )
+
+    def test_renderer_edge_values(self):
+        data = [1e16, 1e-7, -0.0, 2**63 - 1]
+
+        fast = FastJSONRenderer().render(data)
+
+        self.assertEqual(json.loads(fast), json.loads(JSONRenderer().render(data)))
+        self.assertEqual(fast, b"[1e16,1e-7,-0.0,9223372036854775807]")
+        # Too large for orjson, encoded by JSONRenderer.
+        self.assertEqual(FastJSONRenderer().render([2**64]), b"[18446744073709551616]")
+        self.assertEqual(
+            FastJSONRenderer().render([math.nan, math.inf]), b"[null,null]"
+        )
+        with self.assertRaises(ValueError):
+            JSONRenderer().render([math.nan])
+
+
+class SchemaViewTests(APITestCase):
+    def setUp(self):
+        schema.clear_schema_cache()
+        self.addCleanup(schema.clear_schema_cache)
+
+    def get_schema(self, **headers):
+        return self.client.get("/", {"format": "openapi"}, **headers)
+
+    def test_schema_is_generated_once(self):
+        with mock.patch(
+            "core.schema.render_schema", wraps=schema.render_schema
+        ) as render:
+            first = self.get_schema()
+            second = self.get_schema()
+
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertIn("/todo/", json.loads(first.content)["paths"])
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second["ETag"], first["ETag"])
+        self.assertEqual(render.call_count, 1)
+
+    def test_unchanged_schema_is_not_modified(self):
+        etag = self.get_schema()["ETag"]
+
+        response = self.get_schema(HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+    @override_settings(ALLOWED_HOSTS=["api.example.com", "evil.example.com"])
+    def test_document_does_not_depend_on_host_header(self):
+        with mock.patch(
+            "core.schema.render_schema", wraps=schema.render_schema
+        ) as render:
+            first = self.get_schema(HTTP_HOST="api.example.com")
+            second = self.get_schema(HTTP_HOST="evil.example.com")
+
+        self.assertEqual(render.call_count, 1)
+        self.assertEqual(second.content, first.content)
+        self.assertNotIn("host", json.loads(first.content))
+
+    def test_urlconf_change_regenerates_schema(self):
+        self.get_schema()
+
+        clear_url_caches()
+        with mock.patch(
+            "core.schema.render_schema", wraps=schema.render_schema
+        ) as render:
+            self.get_schema()
+
+        self.assertEqual(render.call_count, 1)
+
+    def test_swagger_ui(self):
+        response = self.client.get("/", HTTP_ACCEPT="text/html")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertContains(response, "swagger")
+
+
+@override_settings(SERVER_TIMING_SAMPLE_RATE=1.0)
+class ServerTimingTests(ToDoAPITestCase):
+    def test_timing_header_and_log(self):
+        Todo.objects.create(title="timed")
+
+        with self.assertLogs("core.timing", "INFO") as logs:
+            response = self.client.get("/api/todo/")
+
+        header = response["Server-Timing"]
+        self.assertRegex(
+            header, r'^total;dur=[\d.]+, db;dur=[\d.]+;desc="\d+ queries"$'
+        )
+        record = logs.records[0]
+        self.assertEqual(record.path, "/api/todo/")
+        self.assertEqual(record.status, status.HTTP_200_OK)
+        self.assertGreaterEqual(record.sql_queries, 1)
+        self.assertIn(f'"{record.sql_queries} queries"', header)
+
+    def test_unsampled_requests_are_not_timed(self):
+        with self.settings(SERVER_TIMING_SAMPLE_RATE=0):
+            response = self.client.get("/api/todo/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("Server-Timing", response)
+
+
+class SQLitePragmaTests(APITestCase):
+    def test_pragmas_applied_to_new_connections(self):
+        with self.settings(SQLITE_PRAGMAS={"cache_size": -1234, "temp_store": 2}):
+            connection = connections.create_connection("default")
+            try:
+                with connection.cursor() as cursor:
+                    cache_size = cursor.execute("PRAGMA cache_size").fetchone()
+                    temp_store = cursor.execute("PRAGMA temp_store").fetchone()
+            finally:
+                connection.close()
+
+        self.assertEqual(cache_size, (-1234,))
+        self.assertEqual(temp_store, (2,))
+
+
+class BatchWriterTests(TransactionTestCase):
+    client_class = APIClient
+
+    def setUp(self):
+        cache.clear()
+        self.writer = BatchWriter(batch_size=3, delay=60)
+        self.addCleanup(self.writer.stop)
+
+    def test_full_batch_commits_once(self):
+        with mock.patch(
+            "apis.batching.Todo.objects.bulk_create",
+            wraps=Todo.objects.bulk_create,
+        ) as bulk_create:
+            futures = [self.writer.submit({"title": f"todo {i}"}) for i in range(3)]
+            todos = [future.result(timeout=5) for future in futures]
+
+        self.assertEqual(bulk_create.call_count, 1)
+        self.assertEqual(
+            list(Todo.objects.values_list("id", "title").order_by("id")),
+            [(todo.id, todo.title) for todo in todos],
+        )
+
+    def test_stop_flushes_partial_batch(self):
+        future = self.writer.submit({"title": "last"})
+
+        self.writer.stop()
+
+        self.assertEqual(future.result(timeout=0).title, "last")
+        self.assertTrue(Todo.objects.filter(title="last").exists())
+
+    def test_failed_row_does_not_fail_batch(self):
+        futures = [
+            self.writer.submit({"title": "good"}),
+            self.writer.submit({"title": None}),
+            self.writer.submit({"title": "also good"}),
+        ]
+
+        self.assertEqual(futures[0].result(timeout=5).title, "good")
+        self.assertIsInstance(futures[1].exception(timeout=5), IntegrityError)
+        self.assertEqual(futures[2].result(timeout=5).title, "also good")
+
+    def test_unexpected_error_fails_batch_and_keeps_thread(self):
+        # Building the rows raises.
+        futures = [
+            self.writer.submit({"no_such_field": "x"}),
+            self.writer.submit({"title": "a"}),
+            self.writer.submit({"title": "b"}),
+        ]
+        for future in futures:
+            self.assertIsInstance(future.exception(timeout=5), TypeError)
+
+        # Checking the connection raises.
+        with mock.patch(
+            "apis.batching.close_old_connections", side_effect=RuntimeError
+        ):
+            futures = [self.writer.submit({"title": str(i)}) for i in range(3)]
+            for future in futures:
+                self.assertIsInstance(future.exception(timeout=5), RuntimeError)
+
+        self.assertTrue(self.writer.thread.is_alive())
+        futures = [self.writer.submit({"title": str(i)}) for i in range(3)]
+        self.assertEqual(futures[2].result(timeout=5).title, "2")
+
+    def test_request_writes_row_itself_after_timeout(self):
+        writer = mock.Mock()
+        writer.submit.return_value = Future()
+
+        with mock.patch("apis.batching.COALESCE_WRITES", True), mock.patch(
+            "apis.batching.batch_writer", writer
+        ), mock.patch("apis.batching.WRITE_RESULT_TIMEOUT", 0.01):
+            response = self.client.post(
+                "/api/todo/", {"title": "direct", "text": "x"}, format="json"
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(writer.submit.return_value.cancelled())
+        self.assertEqual(Todo.objects.get().title, "direct")
+
+    def test_create_endpoint_contract(self):
+        writer = BatchWriter(delay=0)
+        self.addCleanup(writer.stop)
+
+        with mock.patch("apis.batching.COALESCE_WRITES", True), mock.patch(
+            "apis.batching.batch_writer", writer
+        ):
+            response = self.client.post(
+                "/api/todo/", {"title": "queued", "text": "x"}, format="json"
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        todo = Todo.objects.get()
+        self.assertEqual(response.data["id"], todo.id)
+        self.assertEqual(response.data["title"], "queued")
+        self.assertIsNotNone(response.data["created_at"])
+
+
+class AsyncToDoViewTests(ToDoAPITestCase):
+    url = "/api/async/todo/"
+
+    async def test_crud(self):
+        response = await self.async_client.post(
+            self.url, {"title": "async", "text": "x"}, content_type="application/json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        todo_id = response.json()["id"]
+        detail = f"{self.url}{todo_id}/"
+
+        response = await self.async_client.patch(
+            detail, {"text": "y"}, content_type="application/json"
+        )
+        self.assertEqual(response.json()["text"], "y")
+        self.assertEqual((await Todo.objects.aget(pk=todo_id)).text, "y")
+
+        response = await self.async_client.get(detail)
+        self.assertEqual(response.json()["title"], "async")
+
+        response = await self.async_client.delete(detail)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        response = await self.async_client.get(detail)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_validation_errors(self):
+        response = await self.async_client.post(
+            self.url, {"text": "no title"}, content_type="application/json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("title", response.json())
+
+        response = await self.async_client.post(
+            self.url, "[not json", content_type="application/json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_list_matches_sync_results(self):
+        Todo.objects.bulk_create(Todo(title=f"todo {i}") for i in range(5))
+
+        results, url = [], f"{self.url}?page_size=2"
+        while url:
+            response = self.client.get(url)
+            results += response.json()["results"]
+            url = response.json()["next"]
+
+        expected = self.client.get("/api/todo/").json()
+        self.assertEqual(results, expected)
+
+    @override_settings(SERVER_TIMING_SAMPLE_RATE=1.0)
+    async def test_server_timing_counts_async_queries(self):
+        await Todo.objects.acreate(title="timed")
+
+        with self.assertLogs("core.timing", "INFO") as logs:
+            response = await self.async_client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertGreaterEqual(logs.records[0].sql_queries, 1)
+
+
+class LoadTestConnectionTests(SimpleTestCase):
+    def request(self, *responses):
+        async def run():
+            connection = Connection("testserver", 80)
+            connection.reader = asyncio.StreamReader()
+            connection.writer = mock.Mock(drain=mock.AsyncMock())
+            connection.reader.feed_data(b"".join(responses))
+            return [await connection.request("GET", "/") for _ in responses]
+
+        return asyncio.run(run())
+
+    def test_reads_chunked_bodies_on_a_kept_alive_connection(self):
+        chunked = (
+            b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n"
+            b"4\r\n[1, \r\n2;ext=1\r\n2]\r\n0\r\n\r\n"
+        )
+        sized = b"HTTP/1.1 201 Created\r\nContent-Length: 2\r\n\r\n{}"
+
+        self.assertEqual(
+            self.request(chunked, sized), [(200, b"[1, 2]"), (201, b"{}")]
+        )
+
+
+class StartupImportTests(SimpleTestCase):
+    def test_docs_stack_is_imported_lazily(self):
+        script = STARTUP_SCRIPT + "import sys; print('drf_yasg.views' in sys.modules)"
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=settings.BASE_DIR,
+            env={**os.environ, "DJANGO_SETTINGS_MODULE": "core.settings"},
+            capture_output=True,
+            text=True,
+        )
+
+        self.assertEqual(result.stdout.strip(), "False", result.stderr)
+
+    def test_parse_importtime(self):
+        output = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |     json.decoder\n"
+            "import time:       300 |        420 |   json\n"
+        )
+
+        self.assertEqual(
+            parse_importtime(output),
+            [("json.decoder", 120, 120, 2), ("json", 300, 420, 1)],
+        )
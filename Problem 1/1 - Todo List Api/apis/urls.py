@@ -1,9 +1,18 @@
+from django.urls import path
 from rest_framework import routers
 
+from apis.async_views import AsyncToDoDetailView, AsyncToDoListView
 from apis.views import ToDoListViewSet
 
 router = routers.DefaultRouter()
 
 router.register("todo", ToDoListViewSet)
 
-urlpatterns = router.urls
+urlpatterns = router.urls + [
+    path("async/todo/", AsyncToDoListView.as_view(), name="todo-async-list"),
+    path(
+        "async/todo/<int:pk>/",
+        AsyncToDoDetailView.as_view(),
+        name="todo-async-detail",
+    ),
+]
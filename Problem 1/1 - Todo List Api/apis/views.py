@@ -1,9 +1,207 @@
+import io
+
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from rest_framework import serializers, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.renderers import BrowsableAPIRenderer
+from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 
-from .models import Todo
-from .serializers import ToDoSerializer
+from .batching import CoalescedCreateMixin
+from .cache import CachedReadMixin
+from .fastpath import FastListMixin
+from .fieldsets import SparseFieldsetFilter, get_requested_fields
+from .models import ChangeCounter, Todo, TodoTombstone
+from .pagination import ToDoCursorPagination
+from .renderers import FastJSONRenderer
+from .search import ToDoSearchFilter
+from .serializers import (
+    BULK_MAX_ITEMS,
+    ToDoBulkDeleteSerializer,
+    ToDoBulkUpdateSerializer,
+    ToDoChangesQuerySerializer,
+    ToDoSerializer,
+)
+from .streaming import CONTENT_TYPES, EXPORTERS, READERS, decode_lines, import_todos
 
 
-class ToDoListViewSet(ModelViewSet):
+class ToDoListViewSet(
+    CachedReadMixin, FastListMixin, CoalescedCreateMixin, ModelViewSet
+):
     queryset = Todo.objects.all()
     serializer_class = ToDoSerializer
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+    pagination_class = ToDoCursorPagination
+    filter_backends = [ToDoSearchFilter, SparseFieldsetFilter]
+
+    def get_serializer_class(self):
+        if self.action == "bulk_update":
+            return ToDoBulkUpdateSerializer
+        if self.action == "bulk_destroy":
+            return ToDoBulkDeleteSerializer
+        return super().get_serializer_class()
+
+    def get_serializer(self, *args, **kwargs):
+        # Schema generation runs without a request when the document is
+        # built by the generate_openapi command.
+        fake_view = getattr(self, "swagger_fake_view", False)
+        if self.action in ("list", "retrieve") and not fake_view:
+            kwargs.setdefault("fields", self.get_requested_fields())
+        return super().get_serializer(*args, **kwargs)
+
+    def get_read_plan_variant(self):
+        return self.get_requested_fields()
+
+    def get_requested_fields(self):
+        """Field names picked with `?fields=` / `?exclude=`, None for all."""
+        if not hasattr(self, "_requested_fields"):
+            self._requested_fields = get_requested_fields(
+                self.request, tuple(ToDoSerializer().fields)
+            )
+        return self._requested_fields
+
+    @action(detail=False, methods=["post"], url_path="bulk", url_name="bulk")
+    def bulk_create(self, request, *args, **kwargs):
+        """Create a list of todos in one transaction."""
+        serializer = self.get_serializer(
+            data=request.data, many=True, max_length=BULK_MAX_ITEMS
+        )
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            serializer.save()
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @bulk_create.mapping.patch
+    def bulk_update(self, request, *args, **kwargs):
+        """Partially update a list of todos, each item must contain its `id`."""
+        ids = []
+        if isinstance(request.data, list) and len(request.data) <= BULK_MAX_ITEMS:
+            id_field = serializers.IntegerField()
+            for item in request.data:
+                try:
+                    ids.append(id_field.run_validation(item.get("id")))
+                except (AttributeError, ValidationError):
+                    pass  # Reported by the item's own validation.
+        instances = self.get_queryset().in_bulk(ids)
+        serializer = self.get_serializer(
+            instances,
+            data=request.data,
+            many=True,
+            partial=True,
+            max_length=BULK_MAX_ITEMS,
+        )
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            serializer.save()
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    @bulk_create.mapping.delete
+    def bulk_destroy(self, request, *args, **kwargs):
+        """
+        Delete a list of todos by id in one transaction, `post_delete` writes
+        their tombstones and bumps the cache version.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data["ids"]
+
+        with transaction.atomic():
+            todos = self.get_queryset().filter(id__in=ids)
+            deleted = set(todos.values_list("id", flat=True))
+            todos.delete()
+
+        response = {
+            "deleted": [pk for pk in ids if pk in deleted],
+            "not_found": [pk for pk in ids if pk not in deleted],
+        }
+        return Response(response, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=["get"])
+    def changes(self, request, *args, **kwargs):
+        """
+        Todos created, updated or deleted after the `since` watermark.
+
+        The watermark is the last `change_id` returned, ids are taken in
+        commit order so a later commit never lands behind it. Pass it as
+        `since` on the next call, while `has_more` is true there are further
+        changes to fetch right away. A watermark older than the pruned
+        tombstones is a 410, the client has to start over from `since=0`.
+        """
+        params = ToDoChangesQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        since = params.validated_data["since"]
+        limit = params.validated_data.get("limit", self.paginator.page_size)
+
+        if since and since < ChangeCounter.get_pruned():
+            return Response(
+                {"detail": "Deletions after this watermark were pruned."},
+                status=status.HTTP_410_GONE,
+            )
+
+        # Updates and deletes share one `change_id` sequence, the page is the
+        # first `limit` ids of both streams merged.
+        changed = list(
+            self.get_queryset().filter(change_id__gt=since).order_by("change_id")[
+                : limit + 1
+            ]
+        )
+        deleted = list(
+            TodoTombstone.objects.filter(change_id__gt=since)
+            .order_by("change_id")
+            .values_list("change_id", "todo_id")[: limit + 1]
+        )
+        change_ids = sorted(
+            [todo.change_id for todo in changed] + [pair[0] for pair in deleted]
+        )
+        has_more = len(change_ids) > limit
+        if has_more:
+            watermark = change_ids[limit - 1]
+        else:
+            watermark = change_ids[-1] if change_ids else since
+
+        response = {
+            "changed": self.get_serializer(
+                [todo for todo in changed if todo.change_id <= watermark], many=True
+            ).data,
+            "deleted": [
+                todo_id for change_id, todo_id in deleted if change_id <= watermark
+            ],
+            "watermark": watermark,
+            "has_more": has_more,
+        }
+        return Response(response, status=status.HTTP_200_OK)
+
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path=r"export/(?P<file_format>ndjson|csv)",
+        url_name="export",
+    )
+    def export_file(self, request, file_format, *args, **kwargs):
+        """Stream every todo as NDJSON or CSV in constant memory."""
+        response = StreamingHttpResponse(
+            EXPORTERS[file_format](self.get_queryset()),
+            content_type=CONTENT_TYPES[file_format],
+        )
+        response["Content-Disposition"] = f'attachment; filename="todos.{file_format}"'
+        return response
+
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path=r"import/(?P<file_format>ndjson|csv)",
+        url_name="import",
+    )
+    def import_file(self, request, file_format, *args, **kwargs):
+        """
+        Create todos from an NDJSON or CSV request body, read line by line
+        and written in chunked transactions.
+
+        Lines that are not UTF-8 are reported as failed rows like any other
+        invalid line.
+        """
+        stream = request.stream or io.BytesIO()
+        result = import_todos(READERS[file_format](decode_lines(stream)))
+        return Response(result, status=status.HTTP_200_OK)
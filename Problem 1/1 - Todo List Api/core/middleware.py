@@ -0,0 +1,115 @@
+import logging
+import random
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger("core.timing")
+
+
+class QueryTimer:
+    """Database execute wrapper counting queries and their cumulative time."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+class ServerTimingMiddleware:
+    """
+    Time a sampled share of the requests and report the total time, the
+    number of SQL queries and the time spent in them.
+
+    The figures go to the `Server-Timing` response header, where browser
+    dev tools pick them up, and to one `core.timing` log line per request.
+    Requests that are not sampled only pay for one `random()` call, the
+    default SERVER_TIMING_SAMPLE_RATE of 0 turns the middleware off.
+
+    Only queries run by the request's own thread are counted. Creates handed
+    to the batch writer (TODO_COALESCE_WRITES) run their INSERT on its
+    thread, their time shows in `total` but they report "0 queries".
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, "SERVER_TIMING_SAMPLE_RATE", 0)
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not self.sampled():
+            return self.get_response(request)
+
+        timer = QueryTimer()
+        start = time.perf_counter()
+        with self.instrument(timer):
+            response = self.get_response(request)
+        return self.report(request, response, timer, start)
+
+    async def __acall__(self, request):
+        if not self.sampled():
+            return await self.get_response(request)
+
+        timer = QueryTimer()
+        start = time.perf_counter()
+        # The ORM runs the queries of async views in the request's sync
+        # thread, the wrappers have to be installed on its connections.
+        stack = await sync_to_async(self.instrument)(timer)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        return self.report(request, response, timer, start)
+
+    def sampled(self):
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def instrument(self, timer):
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(timer))
+        return stack
+
+    def report(self, request, response, timer, start):
+        total = time.perf_counter() - start
+        response["Server-Timing"] = ", ".join(
+            [
+                f"total;dur={total * 1000:.1f}",
+                f'db;dur={timer.duration * 1000:.1f};desc="{timer.count} queries"',
+            ]
+        )
+        logger.info(
+            "%s %s %s %.1fms, %d queries in %.1fms",
+            request.method,
+            request.path,
+            response.status_code,
+            total * 1000,
+            timer.count,
+            timer.duration * 1000,
+            extra={
+                "method": request.method,
+                "path": request.path,
+                "status": response.status_code,
+                "duration_ms": round(total * 1000, 3),
+                "sql_queries": timer.count,
+                "sql_duration_ms": round(timer.duration * 1000, 3),
+            },
+        )
+        return response
@@ -0,0 +1,91 @@
+import hashlib
+
+from django.http import HttpResponse
+from django.urls import get_resolver
+from django.utils.cache import get_conditional_response
+from drf_yasg import openapi
+from drf_yasg.app_settings import swagger_settings
+from drf_yasg.renderers import (
+    OpenAPIRenderer,
+    SwaggerJSONRenderer,
+    SwaggerYAMLRenderer,
+)
+from drf_yasg.views import get_schema_view
+
+API_INFO = openapi.Info(
+    title="Todo List Apis",
+    default_version="v1",
+)
+
+SPEC_RENDERERS = (OpenAPIRenderer, SwaggerJSONRenderer, SwaggerYAMLRenderer)
+
+# Rendered documents keyed on (resolver, version, API URL, renderer).
+# Holding the resolver itself rather than its id() makes entries built
+# for a replaced URLconf unreachable instead of matching a recycled id.
+_documents = {}
+
+
+def render_schema(renderer_class, version="", request=None, url=None):
+    """Generate the OpenAPI document and render it with `renderer_class`."""
+    generator = BaseSchemaView.generator_class(API_INFO, version, url)
+    schema = generator.get_schema(request, public=True)
+    return renderer_class().render(schema)
+
+
+def get_schema_document(request, version):
+    """
+    Return `(content, etag)` of the document the request asks for.
+
+    Generating the schema introspects every view and serializer, so it runs
+    once per URLconf, version and format and the rendered bytes are kept for
+    the lifetime of the process.
+
+    The API URL is SWAGGER_SETTINGS["DEFAULT_API_URL"], never the request's
+    Host header. When it is not set the document has no host and clients
+    use the host that served it.
+    """
+    renderer_class = type(request.accepted_renderer)
+    url = swagger_settings.DEFAULT_API_URL or ""
+    key = (get_resolver(), version, url, renderer_class)
+
+    document = _documents.get(key)
+    if document is None:
+        # Drop documents generated for a URLconf that has been replaced.
+        for stale in [k for k in _documents if k[0] is not key[0]]:
+            _documents.pop(stale, None)
+        content = render_schema(renderer_class, version, request, url)
+        document = content, f'"{hashlib.sha1(content).hexdigest()}"'
+        _documents[key] = document
+    return document
+
+
+def clear_schema_cache():
+    _documents.clear()
+
+
+BaseSchemaView = get_schema_view(API_INFO, public=True)
+
+
+class SchemaView(BaseSchemaView):
+    """
+    drf_yasg schema view serving the JSON/YAML documents from memory with an
+    ETag, so repeated hits and conditional requests cost no introspection.
+
+    The Swagger UI page itself renders without any paths and fetches the
+    document through `?format=openapi`, it is left to drf_yasg.
+    """
+
+    def get(self, request, version="", format=None):
+        if not isinstance(request.accepted_renderer, SPEC_RENDERERS):
+            return super().get(request, version, format)
+
+        version = request.version or version or ""
+        content, etag = get_schema_document(request, version)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            renderer = request.accepted_renderer
+            response = HttpResponse(
+                content, content_type=f"{renderer.media_type}; charset=utf-8"
+            )
+        response["ETag"] = etag
+        return response
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -39,13 +40,20 @@ INSTALLED_APPS = [
     "django.contrib.staticfiles",
     # 3rd Apps
     "rest_framework",
-    "rest_framework_swagger",
-    "drf_yasg",
     # Local Apps
     "apis",
 ]
 
+# API docs at `/`: "lazy" imports the drf_yasg schema stack when the docs are
+# first requested, "eager" while the URLconf loads and "off" removes them.
+API_DOCS = os.environ.get("API_DOCS", "lazy")
+
+if API_DOCS != "off":
+    # Templates and static files of the Swagger UI.
+    INSTALLED_APPS.append("drf_yasg")
+
 MIDDLEWARE = [
+    "core.middleware.ServerTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -86,6 +94,35 @@ DATABASES = {
     }
 }
 
+# DATABASE_PROFILE=production keeps connections open across requests and
+# switches SQLite to WAL, so readers no longer block the single writer and
+# a writer waits for the lock instead of failing with "database is locked".
+DATABASE_PROFILE = os.environ.get("DATABASE_PROFILE", "development")
+
+SQLITE_PRODUCTION_PRAGMAS = {
+    "journal_mode": "wal",
+    # Durable across application crashes, a power loss may only roll back
+    # the last transactions.
+    "synchronous": "normal",
+    "mmap_size": 256 * 1024 * 1024,
+    # Negative values are KiB rather than pages.
+    "cache_size": -64 * 1024,
+    "busy_timeout": 5000,
+    "temp_store": "memory",
+}
+
+# Pragmas applied to every new SQLite connection by apis.db.
+SQLITE_PRAGMAS = {}
+
+if DATABASE_PROFILE == "production":
+    DATABASES["default"].update(
+        {
+            "CONN_MAX_AGE": 600,
+            "CONN_HEALTH_CHECKS": True,
+        }
+    )
+    SQLITE_PRAGMAS = SQLITE_PRODUCTION_PRAGMAS
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -123,7 +160,102 @@ USE_TZ = True
 
 STATIC_URL = "static/"
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# The Todo response cache and its version counter live here, set REDIS_URL
+# when running more than one worker process. The local-memory fallback
+# only keeps entries for TODO_LOCAL_CACHE_TIMEOUT seconds.
+
+REDIS_URL = os.environ.get("REDIS_URL")
+
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+
+# Todo APIs
+
+# Cursor pagination of `GET /api/todo/`, clients may ask for up to
+# TODO_MAX_PAGE_SIZE rows per page with `?page_size=`.
+TODO_PAGE_SIZE = 100
+TODO_MAX_PAGE_SIZE = 1000
+
+# Without `?cursor=`, `?page_size=` or `?count=` the list is returned whole,
+# set to True to paginate every list request.
+TODO_PAGINATE_BY_DEFAULT = False
+
+# Counts of the admin changelist and of `GET /api/todo/?count=true` are
+# exact up to TODO_COUNT_EXACT_THRESHOLD rows. Above it they come from the
+# database statistics or a count cached for TODO_COUNT_CACHE_TIMEOUT seconds.
+TODO_COUNT_EXACT_THRESHOLD = 10000
+TODO_COUNT_CACHE_TIMEOUT = 60
+
+# Days the tombstones of deleted todos are kept for the change feed before
+# the prune_tombstones command deletes them.
+TODO_TOMBSTONE_RETENTION_DAYS = 30
+
+# Largest list accepted by the `/api/todo/bulk/` endpoints.
+TODO_BULK_MAX_ITEMS = 10000
+
+# Cache rendered `GET /api/todo/` responses, set TODO_RESPONSE_CACHE=off in
+# the environment to turn it off, e.g. for the loadtest command. Entries stay
+# cached TODO_RESPONSE_CACHE_TIMEOUT seconds and are also invalidated
+# whenever a todo changes.
+TODO_RESPONSE_CACHE = os.environ.get("TODO_RESPONSE_CACHE", "on") != "off"
+TODO_RESPONSE_CACHE_TIMEOUT = 300
+
+# Used instead with the local-memory cache, which does not see the changes
+# made by other processes and may serve their old responses this long.
+TODO_LOCAL_CACHE_TIMEOUT = 5
+
+# Rows fetched per query and inserted per transaction by the streaming
+# export/import endpoints and the export_todos/import_todos commands.
+TODO_STREAM_CHUNK_SIZE = 2000
+
+# Serve `GET /api/todo/` from `values_list()` rows through a precompiled
+# field plan instead of ToDoSerializer instances, see apis.fastpath.
+TODO_FAST_READ_PATH = True
+
+# Queue `POST /api/todo/` creates to a background thread committing them in
+# batches of up to TODO_WRITE_BATCH_SIZE rows, flushed at the latest
+# TODO_WRITE_BATCH_DELAY seconds after the first row, see apis.batching.
+TODO_COALESCE_WRITES = False
+TODO_WRITE_BATCH_SIZE = 500
+TODO_WRITE_BATCH_DELAY = 0.005
+# Seconds a request waits for its batch before writing the row itself.
+TODO_WRITE_RESULT_TIMEOUT = 30
+
+
+# Request timing
+
+# Share of requests, between 0 and 1, timed by core.middleware and
+# reported in the `Server-Timing` header and the `core.timing` log. Off
+# unless SERVER_TIMING_SAMPLE_RATE is set in the environment.
+SERVER_TIMING_SAMPLE_RATE = float(os.environ.get("SERVER_TIMING_SAMPLE_RATE", 0))
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "core.timing": {"handlers": ["console"], "level": "INFO"},
+    },
+}
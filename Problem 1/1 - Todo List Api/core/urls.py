@@ -15,26 +15,31 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
+from functools import cache
+
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
 
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
 
-schema_view = get_schema_view(
-    openapi.Info(
-        title="Todo List Apis",
-        default_version="v1",
-    ),
-    public=True,
-)
+@cache
+def get_docs_view():
+    from core.schema import SchemaView
+
+    return SchemaView.with_ui("swagger", cache_timeout=0)
+
+
+def docs_view(request, *args, **kwargs):
+    """Swagger UI and schema, drf_yasg is only imported once they are asked for."""
+    return get_docs_view()(request, *args, **kwargs)
+
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/", include("apis.urls")),
-    path(
-        "",
-        schema_view.with_ui("swagger", cache_timeout=0),
-        name="schema-swagger-ui",
-    ),
 ]
+
+if settings.API_DOCS != "off":
+    if settings.API_DOCS == "eager":
+        get_docs_view()
+    urlpatterns.append(path("", docs_view, name="schema-swagger-ui"))
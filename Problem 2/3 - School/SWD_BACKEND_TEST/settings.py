@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.0/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -37,6 +38,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'rest_framework',
     'apis',
 ]
 
@@ -81,6 +83,55 @@ DATABASES = {
     }
 }
 
+# DATABASE_PROFILE=production keeps connections open across requests and
+# switches SQLite to WAL, so readers no longer block the single writer and
+# a writer waits for the lock instead of failing with "database is locked".
+DATABASE_PROFILE = os.environ.get('DATABASE_PROFILE', 'development')
+
+SQLITE_PRODUCTION_PRAGMAS = {
+    'journal_mode': 'wal',
+    # Durable across application crashes, a power loss may only roll back
+    # the last transactions.
+    'synchronous': 'normal',
+    'mmap_size': 256 * 1024 * 1024,
+    # Negative values are KiB rather than pages.
+    'cache_size': -64 * 1024,
+    'busy_timeout': 5000,
+    'temp_store': 'memory',
+}
+
+# Pragmas applied to every new SQLite connection by apis.db.
+SQLITE_PRAGMAS = {}
+
+if DATABASE_PROFILE == 'production':
+    DATABASES['default'].update(
+        {
+            'CONN_MAX_AGE': 600,
+            'CONN_HEALTH_CHECKS': True,
+        }
+    )
+    SQLITE_PRAGMAS = SQLITE_PRODUCTION_PRAGMAS
+
+
+# The cached school hierarchy and its version key have to be shared by every
+# worker process, set REDIS_URL in deployments running more than one. The
+# local-memory fallback only serves a single process.
+REDIS_URL = os.environ.get('REDIS_URL')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.0/ref/settings/#auth-password-validators
@@ -122,3 +173,19 @@ STATIC_URL = 'static/'
 # https://docs.djangoproject.com/en/4.0/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+
+# Largest list of scores accepted by `POST /api/student_score/bulk/`.
+SCORE_BULK_MAX_ITEMS = 10000
+
+# Seconds a process keeps its copy of the subject credits, changes made in
+# the same process invalidate it right away.
+SUBJECT_CREDITS_CACHE_TIMEOUT = 60
+
+# Seconds an unused rendering of `GET /api/school_hierarchy/` stays cached,
+# any change to schools, classes or personnel invalidates it right away.
+SCHOOL_HIERARCHY_CACHE_TIMEOUT = 86400
+
+# Used instead with the local-memory cache, which does not see the changes
+# made by other processes and may serve their old hierarchy this long.
+SCHOOL_HIERARCHY_LOCAL_CACHE_TIMEOUT = 5
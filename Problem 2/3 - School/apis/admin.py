@@ -1,3 +1,13 @@
 from django.contrib import admin
 
-# Register your models here.
+from apis.models import Credits, Subjects
+
+
+@admin.register(Credits)
+class CreditsAdmin(admin.ModelAdmin):
+    list_display = ("id", "credit")
+
+
+@admin.register(Subjects)
+class SubjectsAdmin(admin.ModelAdmin):
+    list_display = ("id", "title", "credit")
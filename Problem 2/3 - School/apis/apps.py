@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class ApisConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apis'
+
+    def ready(self):
+        # The subject credits are loaded by the first lookup, querying here
+        # would hit the database on every import, e.g. by `migrate`.
+        from apis import signals  # noqa: F401
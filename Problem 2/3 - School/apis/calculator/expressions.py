@@ -0,0 +1,32 @@
+from django.db.models import Case, CharField, F, FloatField, Q, Value, When
+
+from apis.calculator.grade import GRADE_BOUNDARIES, MAX_SCORE
+
+
+def _boundary_case(field, values, default, output_field):
+    """`CASE` returning the value of the first `(lowest, value)` reached."""
+    whens = [
+        When(
+            Q(**{f"{field}__gte": lowest, f"{field}__lte": MAX_SCORE}),
+            then=Value(value),
+        )
+        for lowest, value in values
+    ]
+    return Case(*whens, default=Value(default), output_field=output_field)
+
+
+def grade_expression(field="score"):
+    """SQL equivalent of `get_grade` for the score column `field`."""
+    values = [(lowest, grade) for lowest, grade, _ in GRADE_BOUNDARIES]
+    return _boundary_case(field, values, "F", CharField())
+
+
+def grade_points_expression(field="score"):
+    """SQL equivalent of `get_grade_points(get_grade(...))` for `field`."""
+    values = [(lowest, points) for lowest, _, points in GRADE_BOUNDARIES]
+    return _boundary_case(field, values, 0.0, FloatField())
+
+
+def weighted_grade_points_expression(field="score", credit="credit"):
+    """Grade points of `field` multiplied by the `credit` column."""
+    return grade_points_expression(field) * F(credit)
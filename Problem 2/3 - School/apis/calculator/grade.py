@@ -1,3 +1,12 @@
+from array import array
+from bisect import bisect_right
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed to grade NumPy arrays.
+    np = None
+
+
 def get_grade(score: float) -> str:
     if 80 <= score <= 100:
         return "A"  # 4.0
@@ -34,3 +43,113 @@ def get_grade_points(grade: str) -> float:
         return 1.0
     else:
         return 0.0
+
+
+# Lowest score of each grade and its grade points, best grade first. Scores
+# under the last boundary are an F worth 0.0, as in `get_grade`.
+GRADE_BOUNDARIES = (
+    (80, "A", 4.0),
+    (75, "B+", 3.5),
+    (70, "B", 3.0),
+    (65, "C+", 2.5),
+    (60, "C", 2.0),
+    (55, "D+", 1.5),
+    (50, "D", 1.0),
+)
+MAX_SCORE = 100
+
+# Lookup tables of `grade_indexes_many`'s indexes: the grades best first,
+# then F, and their grade points.
+GRADES = tuple(grade for _, grade, _ in GRADE_BOUNDARIES) + ("F",)
+GRADE_POINTS = array("d", [points for _, _, points in GRADE_BOUNDARIES] + [0.0])
+F_INDEX = len(GRADES) - 1
+
+# Ascending lowest scores, the number of them at or under a score counts the
+# grades it reaches from the bottom.
+_LOWEST_SCORES = [lowest for lowest, _, _ in reversed(GRADE_BOUNDARIES)]
+
+
+def _search_grade(score):
+    if score <= MAX_SCORE:
+        return F_INDEX - bisect_right(_LOWEST_SCORES, score)
+    return F_INDEX
+
+
+# Grade indexes of the whole scores, the only ones the API stores, found
+# with one dict lookup. 80.0 hashes like 80, so float scores hit it as well.
+_GRADE_TABLE = {score: _search_grade(score) for score in range(MAX_SCORE + 1)}
+
+
+def _is_ndarray(values):
+    return np is not None and isinstance(values, np.ndarray)
+
+
+def grade_indexes_many(scores):
+    """
+    Grade a sequence of scores like `get_grade`, with a lookup table for
+    whole scores and a binary search over `GRADE_BOUNDARIES` for the rest.
+
+    Takes a list, an `array.array` or any iterable of numbers and returns an
+    `array.array("b")` of indexes into `GRADES`, one byte per score. A NumPy
+    array is graded with `searchsorted` and gives an int8 NumPy array.
+    Scores over MAX_SCORE and NaN are an F.
+    """
+    if _is_ndarray(scores):
+        scores = np.asarray(scores, dtype=np.float64)
+        indexes = F_INDEX - np.searchsorted(_LOWEST_SCORES, scores, side="right")
+        indexes[~(scores <= MAX_SCORE)] = F_INDEX
+        return indexes.astype(np.int8)
+
+    if not isinstance(scores, (list, tuple, array)):
+        scores = list(scores)
+    try:
+        return array("b", map(_GRADE_TABLE.__getitem__, scores))
+    except KeyError:  # Fractional, negative or too high scores.
+        table = _GRADE_TABLE
+        indexes = [
+            table[score] if score in table else _search_grade(score)
+            for score in scores
+        ]
+        return array("b", indexes)
+
+
+def grade_points_of_indexes(grade_indexes):
+    """
+    Grade points of the indexes returned by `grade_indexes_many`, as an
+    `array.array("d")`, or a float64 NumPy array for a NumPy array.
+    """
+    if _is_ndarray(grade_indexes):
+        return np.asarray(GRADE_POINTS)[grade_indexes]
+    return array("d", map(GRADE_POINTS.__getitem__, grade_indexes))
+
+
+def grade_many(scores):
+    """
+    Grades of a sequence of scores like `get_grade`, as a list of str or a
+    NumPy array of `<U2` grades, see `grade_indexes_many`.
+    """
+    indexes = grade_indexes_many(scores)
+    if _is_ndarray(indexes):
+        return np.array(GRADES)[indexes]
+    return list(map(GRADES.__getitem__, indexes))
+
+
+_GRADE_POINTS = dict(zip(GRADES, GRADE_POINTS))
+
+
+def grade_points_many(grades):
+    """
+    Grade points of a sequence of grades like `get_grade_points`, unknown
+    grades are worth 0.0.
+
+    Returns an `array.array("d")`, or a float64 NumPy array for a NumPy
+    array of grades.
+    """
+    if _is_ndarray(grades):
+        points = np.zeros(grades.shape, dtype=np.float64)
+        for grade, grade_points in _GRADE_POINTS.items():
+            points[grades == grade] = grade_points
+        return points
+
+    grade_points = _GRADE_POINTS
+    return array("d", [grade_points.get(grade, 0.0) for grade in grades])
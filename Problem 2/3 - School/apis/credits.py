@@ -0,0 +1,40 @@
+import threading
+import time
+
+from django.conf import settings
+
+from apis.models import Subjects
+
+# Other processes only see a change once their copy expires.
+CREDITS_CACHE_TIMEOUT = getattr(settings, "SUBJECT_CREDITS_CACHE_TIMEOUT", 60)
+
+_lock = threading.Lock()
+_credits = None
+_loaded_at = 0.0
+
+
+def load_subject_credits():
+    """Read `{subject_id: credit}` from the database into the cache."""
+    global _credits, _loaded_at
+    credits = dict(
+        Subjects.objects.filter(credit__isnull=False).values_list(
+            "id", "credit__credit"
+        )
+    )
+    with _lock:
+        _credits, _loaded_at = credits, time.monotonic()
+    return credits
+
+
+def get_subject_credit(subject_id):
+    """Credit of a subject, 0 when the subject has none."""
+    credits = _credits
+    if credits is None or time.monotonic() - _loaded_at > CREDITS_CACHE_TIMEOUT:
+        credits = load_subject_credits()
+    return credits.get(subject_id, 0)
+
+
+def invalidate_subject_credits(**kwargs):
+    global _credits
+    with _lock:
+        _credits = None
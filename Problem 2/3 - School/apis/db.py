@@ -0,0 +1,19 @@
+from django.conf import settings
+
+
+def apply_pragmas(cursor, pragmas):
+    for name, value in pragmas.items():
+        cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def configure_sqlite(connection):
+    """
+    Apply the SQLITE_PRAGMAS setting to a new SQLite connection.
+
+    Pragmas like `synchronous` or `cache_size` only last for the connection
+    they are set on, so they are applied whenever Django opens one.
+    """
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', {})
+    if connection.vendor == 'sqlite' and pragmas:
+        with connection.cursor() as cursor:
+            apply_pragmas(cursor, pragmas)
@@ -0,0 +1,75 @@
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from rest_framework.renderers import JSONRenderer
+
+# Versioned keys never serve stale data, the timeout only bounds how long
+# an unused generation stays in the cache.
+HIERARCHY_CACHE_TIMEOUT = getattr(settings, "SCHOOL_HIERARCHY_CACHE_TIMEOUT", 86400)
+# A local-memory cache is per process, a version bumped by another worker
+# never reaches it, so its documents are only kept this long.
+HIERARCHY_LOCAL_CACHE_TIMEOUT = getattr(
+    settings, "SCHOOL_HIERARCHY_LOCAL_CACHE_TIMEOUT", 5
+)
+HIERARCHY_KEY_PREFIX = "apis:hierarchy"
+VERSION_KEY = f"{HIERARCHY_KEY_PREFIX}:version"
+
+
+def hierarchy_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # Start from the clock, so a version key evicted from the cache does
+        # not restart at a number whose document is still cached.
+        cache.add(VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def bump_hierarchy_version(**kwargs):
+    """Make the next request rebuild the hierarchy."""
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:  # No version yet, nothing is cached.
+        pass
+
+
+def get_hierarchy_document(build, variant=""):
+    """
+    Return `(content, etag)` of the hierarchy as JSON bytes.
+
+    Each `variant`, e.g. a set of filters, is cached on its own. `build()`
+    is only called when the current version of the variant has not been
+    rendered yet, every later request is one or two cache reads.
+    """
+    digest = hashlib.sha1(variant.encode()).hexdigest()
+    key = f"{HIERARCHY_KEY_PREFIX}:{hierarchy_version()}:{digest}"
+    document = cache.get(key)
+    if document is None:
+        content = JSONRenderer().render(build())
+        document = content, f'"{hashlib.sha1(content).hexdigest()}"'
+        cache.set(key, document, get_cache_timeout())
+    return document
+
+
+def get_cache_timeout():
+    if isinstance(caches["default"], LocMemCache):
+        return min(HIERARCHY_CACHE_TIMEOUT, HIERARCHY_LOCAL_CACHE_TIMEOUT)
+    return HIERARCHY_CACHE_TIMEOUT
+
+
+class PrerenderedJSONRenderer(JSONRenderer):
+    """
+    Sends the bytes of `get_hierarchy_document` as they are, and renders
+    them again only when an indent is asked for, e.g. by the browsable API.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, bytes):
+            if self.get_indent(accepted_media_type, renderer_context or {}) is None:
+                return data
+            data = json.loads(data)
+        return super().render(data, accepted_media_type, renderer_context)
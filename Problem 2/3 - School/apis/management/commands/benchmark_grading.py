@@ -0,0 +1,60 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apis.calculator.grade import (
+    GRADES,
+    get_grade,
+    get_grade_points,
+    grade_indexes_many,
+    grade_points_of_indexes,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Time grading random scores with get_grade/get_grade_points one by "
+        "one against grade_indexes_many/grade_points_of_indexes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scores", type=int, default=1_000_000)
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        scores = [rng.randint(0, 100) for _ in range(options["scores"])]
+
+        def scalar():
+            grades = [get_grade(score) for score in scores]
+            return grades, [get_grade_points(grade) for grade in grades]
+
+        def batch():
+            indexes = grade_indexes_many(scores)
+            return indexes, grade_points_of_indexes(indexes)
+
+        expected, elapsed = self.run(scalar, options["repeat"])
+        results = [("get_grade", elapsed)]
+        (indexes, points), elapsed = self.run(batch, options["repeat"])
+        grades = [GRADES[index] for index in indexes]
+        if grades != expected[0] or list(points) != expected[1]:
+            raise CommandError("grade_indexes_many does not match get_grade.")
+        results.append(("grade_indexes_many", elapsed))
+
+        baseline = results[0][1]
+        self.stdout.write(f"{len(scores)} scores, best of {options['repeat']}")
+        for name, elapsed in results:
+            self.stdout.write(
+                f"{name:<20} {elapsed * 1000:>9.1f}ms {baseline / elapsed:>6.1f}x"
+            )
+
+    def run(self, function, repeat):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = function()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return result, best
@@ -0,0 +1,99 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Max
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+
+from apis.models import SchoolStructure
+from apis.views.schools import SchoolStructureAPIView
+
+
+def legacy_structure_tree():
+    """The tree as `SchoolStructureAPIView` built it with one query per node."""
+    all_nodes = SchoolStructure.objects.prefetch_related("schoolstructure_set").all()
+    structured_data_helper = {}
+    context_data = []
+    for node in all_nodes:
+        structured_data_helper[node.id] = {"title": node.title}
+    for node in all_nodes:
+        if node.schoolstructure_set.exists():
+            structured_data_helper[node.id]["sub"] = []
+        if node.parent_id is None:
+            context_data.append(structured_data_helper[node.id])
+        else:
+            parent_dict = structured_data_helper[node.parent_id]
+            parent_dict.setdefault("sub", []).append(structured_data_helper[node.id])
+    return context_data
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Time GET /api/school_structure/ on a synthetic structure of --nodes "
+        "nodes, created in a transaction that is rolled back. With --legacy, "
+        "also time the previous query-per-node build and compare the trees."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--nodes", type=int, default=100_000)
+        parser.add_argument("--fanout", type=int, default=7)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--legacy", action="store_true")
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.create_nodes(options["nodes"], options["fanout"], options["seed"])
+                self.benchmark(options["legacy"])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def create_nodes(self, count, fanout, seed):
+        rng = random.Random(seed)
+        first_id = (SchoolStructure.objects.aggregate(Max("id"))["id__max"] or 0) + 1
+        nodes = []
+        for index in range(count):
+            parent_id = None
+            if index >= fanout:
+                # Mostly the previous level, sometimes a deeper branch.
+                parent_id = first_id + rng.randrange(index // fanout, index)
+            nodes.append(
+                SchoolStructure(
+                    id=first_id + index, title=f"node {index}", parent_id=parent_id
+                )
+            )
+        SchoolStructure.objects.bulk_create(nodes, batch_size=5000)
+        self.stdout.write(f"{SchoolStructure.objects.count()} nodes")
+
+    def benchmark(self, legacy):
+        view = SchoolStructureAPIView.as_view()
+        request = APIRequestFactory().get("/api/school_structure/")
+
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            response = view(request)
+            response.render()
+            elapsed = time.perf_counter() - start
+        self.stdout.write(
+            f"one pass   {elapsed * 1000:>9.1f}ms {len(queries):>7} queries "
+            f"{len(response.content) / 1024:>9.0f}KiB"
+        )
+
+        if legacy:
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                tree = legacy_structure_tree()
+                elapsed = time.perf_counter() - start
+            self.stdout.write(
+                f"legacy     {elapsed * 1000:>9.1f}ms {len(queries):>7} queries "
+                "(tree only, not rendered)"
+            )
+            if tree != response.data:
+                raise CommandError("The trees differ.")
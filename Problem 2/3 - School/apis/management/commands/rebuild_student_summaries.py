@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apis.summary import find_stale_summaries, rebuild_summaries
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute every student's credits, grade points and GPA from the "
+        "scores. With --verify, only report the summaries that differ."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--verify",
+            action="store_true",
+            help="Compare the summaries with the scores without writing.",
+        )
+
+    def handle(self, *args, **options):
+        if not options["verify"]:
+            count = rebuild_summaries()
+            self.stdout.write(f"Rebuilt {count} student summaries.")
+            return
+
+        stale = find_stale_summaries()
+        for student_id, stored, expected in stale:
+            self.stdout.write(
+                f"student {student_id}: stored {describe(stored)}, "
+                f"expected {describe(expected)}"
+            )
+        if stale:
+            raise CommandError(
+                f"{len(stale)} student summaries are out of date, "
+                "run rebuild_student_summaries to fix them."
+            )
+        self.stdout.write("All student summaries are up to date.")
+
+
+def describe(summary):
+    if summary is None:
+        return "nothing"
+    return (
+        f"{summary.total_credits} credits, "
+        f"{summary.total_grade_points:g} grade points, "
+        f"GPA {summary.grade_point_average:.4f}"
+    )
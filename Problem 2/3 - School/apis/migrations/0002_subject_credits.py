@@ -0,0 +1,42 @@
+# Generated by Django 4.2.11 on 2026-10-18 13:44
+
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# The credits and subject mapping hard-coded in StudentSubjectsScoreAPIView.
+CREDITS = {6: 1, 7: 2, 9: 3}
+SUBJECT_CREDITS = {1: 9, 2: 7, 3: 6, 4: 7, 5: 9}
+
+
+def load_credits(apps, schema_editor):
+    Credits = apps.get_model('apis', 'Credits')
+    Subjects = apps.get_model('apis', 'Subjects')
+    for pk, credit in CREDITS.items():
+        Credits.objects.create(id=pk, credit=credit)
+    for subject_id, credit_id in SUBJECT_CREDITS.items():
+        Subjects.objects.filter(id=subject_id).update(credit_id=credit_id)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apis', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Credits',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('credit', models.IntegerField(validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(3)])),
+            ],
+        ),
+        migrations.AddField(
+            model_name='subjects',
+            name='credit',
+            field=models.ForeignKey(blank=True, default=None, null=True, on_delete=django.db.models.deletion.PROTECT, to='apis.credits'),
+        ),
+        migrations.RunPython(load_credits, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 4.2.11 on 2026-10-18 13:46
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+from apis.calculator.grade import get_grade, get_grade_points
+
+
+def build_summaries(apps, schema_editor):
+    StudentSubjectsScore = apps.get_model('apis', 'StudentSubjectsScore')
+    StudentSummary = apps.get_model('apis', 'StudentSummary')
+    totals = {}
+    for student_id, credit, score in StudentSubjectsScore.objects.values_list(
+        'student_id', 'credit', 'score'
+    ).iterator():
+        total_credits, total_grade_points = totals.get(student_id, (0, 0.0))
+        totals[student_id] = (
+            total_credits + credit,
+            total_grade_points + get_grade_points(get_grade(score)) * credit,
+        )
+    StudentSummary.objects.bulk_create(
+        StudentSummary(
+            student_id=student_id,
+            total_credits=total_credits,
+            total_grade_points=total_grade_points,
+            grade_point_average=(
+                total_grade_points / total_credits if total_credits else 0
+            ),
+        )
+        for student_id, (total_credits, total_grade_points) in totals.items()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apis', '0002_subject_credits'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentSummary',
+            fields=[
+                ('student', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='summary', serialize=False, to='apis.personnel')),
+                ('total_credits', models.IntegerField(default=0)),
+                ('total_grade_points', models.FloatField(default=0)),
+                ('grade_point_average', models.FloatField(default=0)),
+            ],
+        ),
+        migrations.RunPython(build_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.11 on 2026-10-18 13:53
+
+from django.db import migrations, models
+
+from apis.structure import compute_paths
+
+
+def build_paths(apps, schema_editor):
+    SchoolStructure = apps.get_model('apis', 'SchoolStructure')
+    paths = compute_paths(SchoolStructure.objects.values_list('id', 'parent_id'))
+    SchoolStructure.objects.bulk_update(
+        [
+            SchoolStructure(id=node_id, path=path, depth=depth)
+            for node_id, (path, depth) in paths.items()
+        ],
+        ['path', 'depth'],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apis', '0003_student_summary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='schoolstructure',
+            name='depth',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='schoolstructure',
+            name='path',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=250),
+        ),
+        migrations.RunPython(build_paths, migrations.RunPython.noop),
+    ]
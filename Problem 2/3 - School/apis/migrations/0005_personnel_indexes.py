@@ -0,0 +1,21 @@
+# Generated by Django 4.2.11 on 2026-10-18 13:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apis', '0004_structure_path'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='personnel',
+            index=models.Index(fields=['first_name', 'last_name'], name='personnel_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='personnel',
+            index=models.Index(fields=['school_class', '-personnel_type', 'first_name', 'last_name'], name='personnel_class_order_idx'),
+        ),
+    ]
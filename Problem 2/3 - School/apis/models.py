@@ -1,4 +1,39 @@
-from django.db import models
+from django.core.exceptions import ValidationError
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.db import models, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Concat, Substr
+
+from apis.structure import (
+    PATH_MAX_LENGTH,
+    compute_paths,
+    path_ids,
+    path_range,
+    path_step,
+)
+
+
+class SchoolStructureQuerySet(models.QuerySet):
+    def subtree(self, node, max_depth=None):
+        """`node` and the nodes under it, at most `max_depth` levels down."""
+        nodes = self.filter(**path_range(node.path))
+        if max_depth is not None:
+            nodes = nodes.filter(depth__lte=node.depth + max_depth)
+        return nodes
+
+    def ancestors(self, node):
+        """The nodes above `node`, root first."""
+        return self.filter(id__in=path_ids(node.path)[:-1]).order_by("depth")
+
+    def rebuild_paths(self):
+        """Recompute every path, e.g. after a `bulk_create`."""
+        paths = compute_paths(self.values_list("id", "parent_id"))
+        nodes = [
+            SchoolStructure(id=node_id, path=path, depth=depth)
+            for node_id, (path, depth) in paths.items()
+        ]
+        self.bulk_update(nodes, ["path", "depth"], batch_size=1000)
+        return len(nodes)
 
 
 class SchoolStructure(models.Model):
@@ -6,6 +41,62 @@ class SchoolStructure(models.Model):
     parent = models.ForeignKey(
         "self", on_delete=models.CASCADE, default=None, null=True, blank=True
     )
+    # Maintained by `save`, see `apis.structure`. `bulk_create`, `update()`,
+    # raw saves and `loaddata` bypass it and leave the path empty or stale,
+    # run `rebuild_paths()` afterwards.
+    path = models.CharField(
+        max_length=PATH_MAX_LENGTH, db_index=True, editable=False, default=""
+    )
+    depth = models.IntegerField(editable=False, default=0)
+
+    objects = SchoolStructureQuerySet.as_manager()
+
+    def save(self, *args, **kwargs):
+        """
+        Save the node and keep the paths up to date. Moving a node to another
+        parent rewrites the paths of its whole branch with one UPDATE.
+        """
+        with transaction.atomic():
+            parent_path, parent_depth = "", -1
+            if self.parent_id is not None:
+                parent_path, parent_depth = (
+                    SchoolStructure.objects.filter(id=self.parent_id)
+                    .values_list("path", "depth")
+                    .get()
+                )
+
+            old_path, old_depth = "", 0
+            if not self._state.adding and self.pk is not None:
+                old_path, old_depth = (
+                    SchoolStructure.objects.filter(id=self.pk)
+                    .values_list("path", "depth")
+                    .first()
+                ) or ("", 0)
+                if old_path and parent_path.startswith(old_path):
+                    raise ValidationError(
+                        {"parent": "A node cannot be moved under itself."}
+                    )
+
+            super().save(*args, **kwargs)
+
+            path = parent_path + path_step(self.pk)
+            if len(path) > PATH_MAX_LENGTH:
+                raise ValidationError({"parent": "The structure is too deep."})
+            depth = parent_depth + 1
+            if path == old_path:
+                self.path, self.depth = path, depth
+                return
+
+            if old_path:
+                SchoolStructure.objects.filter(**path_range(old_path)).update(
+                    path=Concat(Value(path), Substr("path", len(old_path) + 1)),
+                    depth=F("depth") + depth - old_depth,
+                )
+            else:
+                SchoolStructure.objects.filter(id=self.pk).update(
+                    path=path, depth=depth
+                )
+            self.path, self.depth = path, depth
 
 
 class Schools(models.Model):
@@ -45,9 +136,39 @@ class Personnel(models.Model):
         choices=(("class_teacher", 0), ("head_of_the_room", 1), ("student", 2)),
     )
 
+    class Meta:
+        indexes = [
+            # Score writes look students up by name.
+            models.Index(
+                fields=["first_name", "last_name"], name="personnel_name_idx"
+            ),
+            # Personnel of a class in hierarchy and details order.
+            models.Index(
+                fields=["school_class", "-personnel_type", "first_name", "last_name"],
+                name="personnel_class_order_idx",
+            ),
+        ]
+
+
+class Credits(models.Model):
+    credit = models.IntegerField(
+        null=False,
+        blank=False,
+        validators=[MinValueValidator(1), MaxValueValidator(3)],
+    )
+
+    def __str__(self):
+        return f"{self.credit} credit(s)"
+
 
 class Subjects(models.Model):
     title = models.CharField(max_length=50, unique=True, null=False, blank=False)
+    credit = models.ForeignKey(
+        Credits, on_delete=models.PROTECT, default=None, null=True, blank=True
+    )
+
+    def __str__(self):
+        return self.title
 
 
 class StudentSubjectsScore(models.Model):
@@ -66,3 +187,14 @@ class StudentSubjectsScore(models.Model):
                 fields=["student", "subjects"], name="unique_subject_score"
             )
         ]
+
+
+class StudentSummary(models.Model):
+    """Totals of a student's scores, kept up to date by `apis.summary`."""
+
+    student = models.OneToOneField(
+        Personnel, on_delete=models.CASCADE, primary_key=True, related_name="summary"
+    )
+    total_credits = models.IntegerField(null=False, blank=False, default=0)
+    total_grade_points = models.FloatField(null=False, blank=False, default=0)
+    grade_point_average = models.FloatField(null=False, blank=False, default=0)
@@ -0,0 +1,13 @@
+from rest_framework.pagination import PageNumberPagination
+
+
+class TranscriptPagination(PageNumberPagination):
+    page_size = 100
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+
+
+class SchoolPagination(PageNumberPagination):
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 100
@@ -0,0 +1,57 @@
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_migrate, post_save
+from django.dispatch import receiver
+
+from apis.credits import invalidate_subject_credits
+from apis.db import configure_sqlite
+from apis.hierarchy import bump_hierarchy_version
+from apis.models import (
+    Classes,
+    Credits,
+    Personnel,
+    Schools,
+    StudentSubjectsScore,
+    Subjects,
+)
+from apis.summary import record_score_change, weighted_grade_points
+
+
+@receiver(connection_created)
+def connection_opened(sender, connection, **kwargs):
+    configure_sqlite(connection)
+
+
+@receiver(post_save, sender=Credits)
+@receiver(post_delete, sender=Credits)
+@receiver(post_save, sender=Subjects)
+@receiver(post_delete, sender=Subjects)
+@receiver(post_migrate)
+def credits_changed(sender, **kwargs):
+    # Dropped once the change is visible, a lookup in between would
+    # otherwise reload and keep the old credits.
+    transaction.on_commit(invalidate_subject_credits)
+
+
+@receiver(post_save, sender=Schools)
+@receiver(post_delete, sender=Schools)
+@receiver(post_save, sender=Classes)
+@receiver(post_delete, sender=Classes)
+@receiver(post_save, sender=Personnel)
+@receiver(post_delete, sender=Personnel)
+def hierarchy_changed(sender, **kwargs):
+    # Bumped once the change is visible, a request rebuilding in between
+    # would otherwise cache the old rows under the new version.
+    transaction.on_commit(bump_hierarchy_version)
+
+
+@receiver(post_delete, sender=StudentSubjectsScore)
+def score_deleted(sender, instance, **kwargs):
+    # Also sent for scores deleted by a cascade, where the summary may be
+    # gone with its student already, so none is created.
+    record_score_change(
+        instance.student_id,
+        -instance.credit,
+        -weighted_grade_points(instance.credit, instance.score),
+        create=False,
+    )
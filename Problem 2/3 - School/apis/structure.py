@@ -0,0 +1,45 @@
+# A node's path is the zero-padded ids of its ancestors and itself, so the
+# paths of a branch share its root's path as prefix and sort depth first.
+PATH_STEP_WIDTH = 10
+PATH_MAX_LENGTH = 250
+
+
+def path_step(node_id):
+    return f"{node_id:0{PATH_STEP_WIDTH}d}"
+
+
+def path_ids(path):
+    """Ids of the nodes along `path`, root first."""
+    return [
+        int(path[start : start + PATH_STEP_WIDTH])
+        for start in range(0, len(path), PATH_STEP_WIDTH)
+    ]
+
+
+def path_range(path, field="path"):
+    """
+    Lookups matching `path` and every path under it as an index range.
+
+    `startswith` would be a LIKE, which SQLite only runs on an index when it
+    is case sensitive. Paths are digits and ":" sorts right after "9".
+    """
+    return {f"{field}__gte": path, f"{field}__lt": path + ":"}
+
+
+def compute_paths(rows):
+    """Map the ids of `(id, parent_id)` rows to their `(path, depth)`."""
+    parents = dict(rows)
+    paths = {}
+    for node_id in parents:
+        # Walk up to the first node with a known path, then back down.
+        chain = []
+        while node_id is not None and node_id not in paths:
+            chain.append(node_id)
+            node_id = parents[node_id]
+            if len(chain) > len(parents):
+                raise ValueError(f"The structure has a cycle through {node_id}.")
+        path, depth = paths[node_id] if node_id is not None else ("", -1)
+        for node_id in reversed(chain):
+            path, depth = path + path_step(node_id), depth + 1
+            paths[node_id] = path, depth
+    return paths
@@ -0,0 +1,118 @@
+import math
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Case, Exists, F, FloatField, OuterRef, Value, When
+
+from apis.calculator.grade import get_grade, get_grade_points
+from apis.models import StudentSubjectsScore, StudentSummary
+
+
+def weighted_grade_points(credit, score):
+    return get_grade_points(get_grade(score)) * credit
+
+
+def record_score_change(student_id, credit_delta, points_delta, create=True):
+    """
+    Add a score change to the student's summary, in the caller's
+    transaction.
+
+    The totals are incremented with one UPDATE, so concurrent writes of
+    different scores of the same student do not lose each other's changes.
+    Callers updating a score compute its delta from the row read with
+    `select_for_update()`. A student without a summary yet gets one computed
+    from the stored scores, unless `create` is False.
+    """
+    new_credits = F("total_credits") + credit_delta
+    new_points = F("total_grade_points") + points_delta
+    updated = StudentSummary.objects.filter(student_id=student_id).update(
+        total_credits=new_credits,
+        total_grade_points=new_points,
+        grade_point_average=Case(
+            When(total_credits__gt=-credit_delta, then=new_points / new_credits),
+            default=Value(0.0),
+            output_field=FloatField(),
+        ),
+    )
+    if not updated and create:
+        rebuild_summaries([student_id])
+
+
+def compute_summaries(student_ids=None):
+    """Return unsaved `{student_id: StudentSummary}` computed from the scores."""
+    scores = StudentSubjectsScore.objects.values_list("student_id", "credit", "score")
+    if student_ids is not None:
+        scores = scores.filter(student_id__in=student_ids)
+
+    totals = defaultdict(lambda: [0, 0.0])
+    for student_id, credit, score in scores.iterator():
+        total = totals[student_id]
+        total[0] += credit
+        total[1] += weighted_grade_points(credit, score)
+
+    return {
+        student_id: StudentSummary(
+            student_id=student_id,
+            total_credits=total_credits,
+            total_grade_points=total_grade_points,
+            grade_point_average=(
+                total_grade_points / total_credits if total_credits else 0
+            ),
+        )
+        for student_id, (total_credits, total_grade_points) in totals.items()
+    }
+
+
+def rebuild_summaries(student_ids=None):
+    """
+    Recompute the summaries of `student_ids`, or of every student, from the
+    scores with one read and one upsert. Return the number of summaries.
+    """
+    summaries = compute_summaries(student_ids)
+    # Summaries of students whose scores are all gone.
+    stale = StudentSummary.objects.exclude(
+        Exists(StudentSubjectsScore.objects.filter(student_id=OuterRef("student_id")))
+    )
+    if student_ids is not None:
+        stale = stale.filter(student_id__in=student_ids)
+
+    with transaction.atomic(savepoint=False):
+        stale.delete()
+        StudentSummary.objects.bulk_create(
+            summaries.values(),
+            update_conflicts=True,
+            unique_fields=["student"],
+            update_fields=[
+                "total_credits",
+                "total_grade_points",
+                "grade_point_average",
+            ],
+        )
+    return len(summaries)
+
+
+def find_stale_summaries():
+    """
+    Compare the stored summaries with the scores and return
+    `[(student_id, stored, expected)]` for those that differ, missing
+    summaries are None.
+    """
+    expected = compute_summaries()
+    stored = StudentSummary.objects.in_bulk()
+    stale = []
+    for student_id in sorted(expected.keys() | stored.keys()):
+        summary = stored.get(student_id)
+        computed = expected.get(student_id)
+        if not same_totals(summary, computed):
+            stale.append((student_id, summary, computed))
+    return stale
+
+
+def same_totals(summary, other):
+    # A summary left at zero by deleting every score matches no summary.
+    summary = summary or StudentSummary()
+    other = other or StudentSummary()
+    return summary.total_credits == other.total_credits and all(
+        math.isclose(getattr(summary, name), getattr(other, name), abs_tol=1e-9)
+        for name in ("total_grade_points", "grade_point_average")
+    )
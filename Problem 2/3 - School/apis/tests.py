@@ -1,3 +1,981 @@
-from django.test import TestCase
+import unittest
+from array import array
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.apps import apps
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.management import CommandError, call_command
+from django.db import connection, connections
+from django.db.models import Value
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apis import credits
+from apis.calculator.expressions import grade_expression, grade_points_expression
+from apis.calculator.grade import (
+    GRADE_BOUNDARIES,
+    GRADES,
+    get_grade,
+    get_grade_points,
+    grade_indexes_many,
+    grade_many,
+    grade_points_many,
+    grade_points_of_indexes,
+    np,
+)
+from apis.models import (
+    Classes,
+    Credits,
+    Personnel,
+    SchoolStructure,
+    Schools,
+    StudentSubjectsScore,
+    StudentSummary,
+    Subjects,
+)
+from apis.summary import rebuild_summaries
+from apis.views.schools import build_structure_tree, find_students
+
+
+class SQLitePragmaTests(TestCase):
+    def test_pragmas_applied_to_new_connections(self):
+        with self.settings(SQLITE_PRAGMAS={'cache_size': -1234, 'temp_store': 2}):
+            connection = connections.create_connection('default')
+            try:
+                with connection.cursor() as cursor:
+                    cache_size = cursor.execute('PRAGMA cache_size').fetchone()
+                    temp_store = cursor.execute('PRAGMA temp_store').fetchone()
+            finally:
+                connection.close()
+
+        self.assertEqual(cache_size, (-1234,))
+        self.assertEqual(temp_store, (2,))
+
+
+class SchoolAPITestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        school = Schools.objects.create(title="Dorm Palace School")
+        school_class = Classes.objects.create(school=school, class_order=1)
+        cls.student = Personnel.objects.create(
+            first_name="Aaron", last_name="Marquez", school_class=school_class
+        )
+        cls.other_student = Personnel.objects.create(
+            first_name="Lindsay", last_name="Haas", school_class=school_class
+        )
+        # Created by the 0002_subject_credits migration.
+        by_value = {credit.credit: credit for credit in Credits.objects.all()}
+        for title, credit in (("Math", 3), ("Physics", 2), ("Chemistry", 1)):
+            Subjects.objects.create(title=title, credit=by_value[credit])
+
+
+class StudentSubjectsScoreBulkTests(SchoolAPITestCase):
+    url = "/api/student_score/bulk/"
+
+    def item(self, student, subject_title, score):
+        return {
+            "first_name": student.first_name,
+            "last_name": student.last_name,
+            "subject_title": subject_title,
+            "score": score,
+        }
+
+    def test_bulk_upsert(self):
+        StudentSubjectsScore.objects.create(
+            student=self.student,
+            subjects=Subjects.objects.get(title="Physics"),
+            credit=5,
+            score=10,
+        )
+        items = [
+            self.item(self.student, "Math", 80),
+            self.item(self.student, "Physics", 70),
+            self.item(self.other_student, "Chemistry", 60),
+        ]
+        credits.load_subject_credits()
+
+        # Lookups, the upsert and the rebuild of the two students' summaries.
+        with self.assertNumQueries(8):
+            response = self.client.post(self.url, items, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"saved": 3, "errors": []})
+        scores = StudentSubjectsScore.objects.values_list(
+            "student_id", "subjects__title", "credit", "score"
+        )
+        self.assertCountEqual(
+            scores,
+            [
+                (self.student.id, "Math", 3, 80),
+                # Updating keeps the stored credit.
+                (self.student.id, "Physics", 5, 70),
+                (self.other_student.id, "Chemistry", 1, 60),
+            ],
+        )
+
+    def test_errors_are_reported_per_item(self):
+        items = [
+            self.item(self.student, "Math", 101),
+            {
+                "first_name": "Nobody",
+                "last_name": "Here",
+                "subject_title": "Math",
+                "score": 1,
+            },
+            self.item(self.student, "Art", 50),
+            self.item(self.student, "Math", 50),
+            self.item(self.student, "Math", 55),
+        ]
+
+        response = self.client.post(self.url, items, format="json")
+
+        self.assertEqual(response.data["saved"], 1)
+        self.assertEqual(
+            [error["index"] for error in response.data["errors"]], [0, 1, 2]
+        )
+        self.assertIn("score", response.data["errors"][0]["errors"])
+        self.assertEqual(
+            StudentSubjectsScore.objects.get(student=self.student).score, 55
+        )
+
+    def test_payload_must_be_a_list(self):
+        response = self.client.post(
+            self.url, self.item(self.student, "Math", 1), format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_student_lookup_is_chunked(self):
+        names = {("Aaron", "Marquez"), ("Lindsay", "Haas"), ("Nobody", "Here")}
+
+        with self.assertNumQueries(2):
+            students = find_students(names, chunk_size=2)
+
+        self.assertEqual(
+            students,
+            {
+                ("Aaron", "Marquez"): self.student.id,
+                ("Lindsay", "Haas"): self.other_student.id,
+            },
+        )
+
+
+class SubjectCreditsTests(SchoolAPITestCase):
+    def setUp(self):
+        credits.invalidate_subject_credits()
+        self.math = Subjects.objects.get(title="Math")
+
+    def test_lookups_are_served_from_memory(self):
+        credits.get_subject_credit(self.math.id)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(credits.get_subject_credit(self.math.id), 3)
+            self.assertEqual(credits.get_subject_credit(0), 0)
+
+    def test_changes_invalidate_cache(self):
+        self.assertEqual(credits.get_subject_credit(self.math.id), 3)
+
+        self.math.credit = Credits.objects.get(credit=1)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.math.save()
+        self.assertEqual(credits.get_subject_credit(self.math.id), 1)
+
+        credit = self.math.credit
+        credit.refresh_from_db()
+        credit.credit = 2
+        with self.captureOnCommitCallbacks(execute=True):
+            credit.save()
+        self.assertEqual(credits.get_subject_credit(self.math.id), 2)
+
+    def test_expired_cache_is_reloaded(self):
+        credits.get_subject_credit(self.math.id)
+        Subjects.objects.filter(id=self.math.id).update(credit=None)
+
+        with mock.patch("apis.credits.CREDITS_CACHE_TIMEOUT", -1):
+            self.assertEqual(credits.get_subject_credit(self.math.id), 0)
+
+    def test_startup_does_not_query(self):
+        with self.assertNumQueries(0):
+            apps.get_app_config("apis").ready()
+
+        self.assertIsNone(credits._credits)
+
+    def test_new_score_takes_subject_credit(self):
+        response = self.client.post(
+            "/api/student_score/",
+            {
+                "first_name": "Aaron",
+                "last_name": "Marquez",
+                "subject_title": "Math",
+                "score": 90,
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["credit"], 3)
+
+
+class StudentSummaryTests(SchoolAPITestCase):
+    def post_score(self, student, subject_title, score):
+        return self.client.post(
+            "/api/student_score/",
+            {
+                "first_name": student.first_name,
+                "last_name": student.last_name,
+                "subject_title": subject_title,
+                "score": score,
+            },
+            format="json",
+        )
+
+    def assertSummary(self, student, total_credits, total_grade_points, gpa):
+        summary = StudentSummary.objects.get(student=student)
+        self.assertEqual(
+            (
+                summary.total_credits,
+                summary.total_grade_points,
+                summary.grade_point_average,
+            ),
+            (total_credits, total_grade_points, gpa),
+        )
+
+    def test_score_writes_update_summary(self):
+        self.post_score(self.student, "Math", 80)  # A, 3 credits
+        self.assertSummary(self.student, 3, 12.0, 4.0)
+
+        self.post_score(self.student, "Physics", 72)  # B, 2 credits
+        self.assertSummary(self.student, 5, 18.0, 3.6)
+
+        self.post_score(self.student, "Math", 55)  # D+
+        self.assertSummary(self.student, 5, 10.5, 2.1)
+
+    def test_bulk_writes_update_summary(self):
+        self.post_score(self.student, "Math", 80)
+
+        self.client.post(
+            "/api/student_score/bulk/",
+            [
+                {
+                    "first_name": "Aaron",
+                    "last_name": "Marquez",
+                    "subject_title": "Chemistry",
+                    "score": 40,
+                },
+            ],
+            format="json",
+        )
+
+        self.assertSummary(self.student, 4, 12.0, 3.0)
+
+    def test_details_read_gpa_from_summary(self):
+        self.post_score(self.student, "Math", 80)
+        self.post_score(self.student, "Physics", 66)
+        url = f"/api/student_score/{self.student.id}/"
+
+        # Student with school and summary, then the scores.
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+
+        self.assertEqual(response.data["grade_point_average"], 3.4)
+        self.assertEqual(
+            [detail["grade"] for detail in response.data["subject_detail"]],
+            ["A", "C+"],
+        )
+        self.assertEqual(response.data["student"]["school"], "Dorm Palace School")
+
+    def test_details_without_scores(self):
+        response = self.client.get(f"/api/student_score/{self.other_student.id}/")
+
+        self.assertEqual(response.data["grade_point_average"], 0)
+        self.assertEqual(response.data["subject_detail"], [])
+
+    def test_deletes_update_summary(self):
+        self.post_score(self.student, "Math", 80)  # A, 3 credits
+        self.post_score(self.student, "Physics", 72)  # B, 2 credits
+        self.post_score(self.student, "Chemistry", 60)  # C, 1 credit
+
+        StudentSubjectsScore.objects.get(subjects__title="Physics").delete()
+        self.assertSummary(self.student, 4, 14.0, 3.5)
+
+        # Cascaded from the subject.
+        Subjects.objects.get(title="Chemistry").delete()
+        self.assertSummary(self.student, 3, 12.0, 4.0)
+
+        StudentSubjectsScore.objects.all().delete()
+        self.assertSummary(self.student, 0, 0.0, 0.0)
+        call_command("rebuild_student_summaries", "--verify", stdout=StringIO())
+
+    def test_deleting_student_removes_summary(self):
+        self.post_score(self.student, "Math", 80)
+
+        self.student.delete()
+
+        self.assertFalse(StudentSummary.objects.exists())
+
+    def test_rebuild_and_verify(self):
+        self.post_score(self.student, "Math", 80)
+        StudentSubjectsScore.objects.filter(student=self.student).update(score=0)
+        StudentSummary.objects.create(student=self.other_student, total_credits=9)
+
+        with self.assertRaises(CommandError):
+            call_command("rebuild_student_summaries", "--verify", stdout=StringIO())
+
+        call_command("rebuild_student_summaries", stdout=StringIO())
+        call_command("rebuild_student_summaries", "--verify", stdout=StringIO())
+        self.assertSummary(self.student, 3, 0.0, 0.0)
+        self.assertFalse(
+            StudentSummary.objects.filter(student=self.other_student).exists()
+        )
+
+
+class PersonnelDetailsTests(SchoolAPITestCase):
+    url = "/api/personnel_details/Dorm Palace School/"
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        school = cls.student.school_class.school
+        second_class = Classes.objects.create(school=school, class_order=2)
+        for first_name, school_class, personnel_type in (
+            ("Mark", second_class, 0),
+            ("Jared", cls.student.school_class, 0),
+            ("Nathan", second_class, 1),
+            ("Zoe", second_class, 2),
+            ("Owen", cls.student.school_class, 7),
+            ("Ivy", second_class, -1),
+        ):
+            Personnel.objects.create(
+                first_name=first_name,
+                last_name="Smith",
+                school_class=school_class,
+                personnel_type=personnel_type,
+            )
+
+    def test_same_output_as_single_ordered_query(self):
+        roles = {0: "Teacher", 1: "Head of the room", 2: "Student"}
+        expected = [
+            f"{index}. school: Dorm palace school, "
+            f"role: {roles.get(person.personnel_type, 'Unknown')}, "
+            f"class: {person.school_class.class_order}, "
+            f"name: {person.first_name.capitalize()} {person.last_name.capitalize()}"
+            for index, person in enumerate(
+                Personnel.objects.select_related("school_class").order_by(
+                    "personnel_type",
+                    "school_class__class_order",
+                    "first_name",
+                    "last_name",
+                ),
+                start=1,
+            )
+        ]
+
+        # Unknown types, then one query per role.
+        with self.assertNumQueries(4):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.json(), expected)
+        self.assertIn("role: Unknown, class: 2, name: Ivy Smith", expected[0])
+        self.assertIn("role: Unknown, class: 1, name: Owen Smith", expected[-1])
+
+
+class GradeManyTests(SimpleTestCase):
+    scores = [0, 49, 49.9, 50, 54.5, 55, 60, 65, 70, 74.99, 75, 79, 80, 99.5, 100]
+    edge_scores = [-1, 100.5, 101, float("nan")]
+
+    def test_matches_scalar_grades(self):
+        scores = self.scores + self.edge_scores
+
+        for values in (scores, tuple(scores), array("d", scores), iter(scores)):
+            with self.subTest(type=type(values).__name__):
+                self.assertEqual(
+                    grade_many(values), [get_grade(score) for score in scores]
+                )
+
+    def test_whole_scores(self):
+        scores = list(range(101))
+
+        indexes = grade_indexes_many(scores)
+
+        self.assertIsInstance(indexes, array)
+        self.assertEqual(indexes.typecode, "b")
+        self.assertEqual(
+            [GRADES[index] for index in indexes], [get_grade(score) for score in scores]
+        )
+        self.assertEqual(grade_indexes_many(array("i", scores)), indexes)
+
+    def test_grade_points(self):
+        grades = ["A", "B+", "B", "C+", "C", "D+", "D", "F", "X"]
+
+        points = grade_points_many(grades)
+
+        self.assertIsInstance(points, array)
+        self.assertEqual(list(points), [get_grade_points(grade) for grade in grades])
+
+    def test_grade_points_of_indexes(self):
+        scores = self.scores + self.edge_scores
+
+        points = grade_points_of_indexes(grade_indexes_many(scores))
+
+        self.assertIsInstance(points, array)
+        self.assertEqual(
+            list(points), [get_grade_points(get_grade(score)) for score in scores]
+        )
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_numpy_arrays(self):
+        scores = self.scores + self.edge_scores
+
+        grades = grade_many(np.array(scores))
+        points = grade_points_of_indexes(grade_indexes_many(np.array(scores)))
+
+        self.assertEqual(grades.tolist(), [get_grade(score) for score in scores])
+        self.assertEqual(points.dtype, np.float64)
+        self.assertEqual(
+            points.tolist(), [get_grade_points(get_grade(score)) for score in scores]
+        )
+        self.assertEqual(grade_points_many(grades).tolist(), points.tolist())
+
+
+class GradeExpressionTests(SchoolAPITestCase):
+    def test_expressions_match_python_grades(self):
+        scores = {0, 100}
+        for lowest, _, _ in GRADE_BOUNDARIES:
+            scores.update((lowest - 1, lowest))
+
+        for score in sorted(scores):
+            with self.subTest(score=score):
+                grade, grade_points = (
+                    Subjects.objects.annotate(score=Value(score))
+                    .annotate(
+                        grade=grade_expression(), grade_points=grade_points_expression()
+                    )
+                    .values_list("grade", "grade_points")
+                    .first()
+                )
+                self.assertEqual(grade, get_grade(score))
+                self.assertEqual(grade_points, get_grade_points(get_grade(score)))
+
+
+class SchoolTranscriptsTests(SchoolAPITestCase):
+    url = "/api/transcripts/Dorm Palace School/"
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        second_class = Classes.objects.create(
+            school=cls.student.school_class.school, class_order=2
+        )
+        cls.third_student = Personnel.objects.create(
+            first_name="Abigail", last_name="Beck", school_class=second_class
+        )
+        Personnel.objects.create(
+            first_name="Mark",
+            last_name="Harmon",
+            school_class=second_class,
+            personnel_type=0,
+        )
+        subjects = dict(Subjects.objects.values_list("title", "id"))
+        for student, title, credit, score in (
+            (cls.student, "Math", 3, 80),
+            (cls.student, "Physics", 2, 66),
+            (cls.other_student, "Chemistry", 1, 49),
+        ):
+            StudentSubjectsScore.objects.create(
+                student=student, subjects_id=subjects[title], credit=credit, score=score
+            )
+        rebuild_summaries()
+
+    def test_transcripts(self):
+        # School, count, students with their GPA, scores.
+        with self.assertNumQueries(4):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 3)
+        results = response.data["results"]
+        self.assertEqual(
+            [result["student"]["full_name"] for result in results],
+            ["Aaron Marquez", "Lindsay Haas", "Abigail Beck"],
+        )
+        self.assertEqual(
+            results[0]["subject_detail"],
+            [
+                {
+                    "subject": "Math",
+                    "credit": 3,
+                    "score": 80,
+                    "grade": "A",
+                    "grade_points": 4.0,
+                },
+                {
+                    "subject": "Physics",
+                    "credit": 2,
+                    "score": 66,
+                    "grade": "C+",
+                    "grade_points": 2.5,
+                },
+            ],
+        )
+        self.assertEqual(
+            [result["grade_point_average"] for result in results], [3.4, 0, 0]
+        )
+        self.assertEqual(results[2]["subject_detail"], [])
+
+    def test_gpa_matches_student_details(self):
+        response = self.client.get(self.url)
+
+        for result in response.data["results"]:
+            details = self.client.get(
+                f"/api/student_score/{result['student']['id']}/"
+            )
+            self.assertEqual(
+                result["grade_point_average"], details.data["grade_point_average"]
+            )
+
+    def test_class_filter_and_pages(self):
+        response = self.client.get(self.url, {"class_order": 1, "page_size": 1})
+
+        self.assertEqual(response.data["count"], 2)
+        self.assertIsNotNone(response.data["next"])
+        self.assertEqual(
+            response.data["results"][0]["student"]["id"], self.student.id
+        )
+
+        for value in ("first", "²"):
+            response = self.client.get(self.url, {"class_order": value})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_unknown_school(self):
+        response = self.client.get("/api/transcripts/Nowhere/")
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class SchoolHierarchyCacheTests(SchoolAPITestCase):
+    url = "/api/school_hierarchy/"
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.teacher = Personnel.objects.create(
+            first_name="Mark",
+            last_name="Harmon",
+            school_class=cls.student.school_class,
+            personnel_type=0,
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_hits_skip_the_database(self):
+        with self.assertNumQueries(3):
+            first = self.client.get(self.url)
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(first["ETag"], second["ETag"])
+        self.assertEqual(
+            first.json(),
+            [
+                {
+                    "school": "Dorm Palace School",
+                    "class 1": {
+                        "Teacher: Mark Harmon": [
+                            {"Student": "Aaron Marquez"},
+                            {"Student": "Lindsay Haas"},
+                        ]
+                    },
+                }
+            ],
+        )
+
+    def test_conditional_request(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+
+    def test_changes_invalidate_after_commit(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Personnel.objects.create(
+                first_name="Benjamin",
+                last_name="Collins",
+                school_class=self.student.school_class,
+                personnel_type=1,
+            )
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertIn(
+            {"Head of the room": "Benjamin Collins"},
+            response.json()[0]["class 1"]["Teacher: Mark Harmon"],
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Schools.objects.all().delete()
+        self.assertEqual(self.client.get(self.url).json(), [])
+
+    def test_browsable_api(self):
+        response = self.client.get(self.url, HTTP_ACCEPT="text/html")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/html; charset=utf-8")
+        self.assertContains(response, "Aaron Marquez")
+
+    def test_local_cache_keeps_documents_briefly(self):
+        with mock.patch.object(cache, "set", wraps=cache.set) as cache_set:
+            self.client.get(self.url)
+
+        self.assertEqual(cache_set.call_args.args[2], 5)
+
+
+class SchoolHierarchyFilterTests(SchoolAPITestCase):
+    url = "/api/school_hierarchy/"
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.school = cls.student.school_class.school
+        cls.other_school = Schools.objects.create(title="Rose Garden School")
+        for school, class_order, first_name in (
+            (cls.school, 1, "Mark"),
+            (cls.school, 2, "Jared"),
+            (cls.other_school, 1, "Reed"),
+        ):
+            school_class, _ = Classes.objects.get_or_create(
+                school=school, class_order=class_order
+            )
+            Personnel.objects.create(
+                first_name=first_name,
+                last_name="Teacher",
+                school_class=school_class,
+                personnel_type=0,
+            )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_school_filter(self):
+        by_title = self.client.get(self.url, {"school": "Rose Garden School"})
+        by_id = self.client.get(self.url, {"school": self.other_school.id})
+
+        self.assertEqual(
+            by_title.json(),
+            [
+                {
+                    "school": "Rose Garden School",
+                    "class 1": {"Teacher: Reed Teacher": []},
+                }
+            ],
+        )
+        self.assertEqual(by_id.content, by_title.content)
+        self.assertEqual(self.client.get(self.url, {"school": "Nowhere"}).json(), [])
+
+    def test_class_range_filter(self):
+        response = self.client.get(
+            self.url, {"school": "Dorm Palace School", "class_from": 2}
+        )
+
+        self.assertEqual(
+            response.json(),
+            [
+                {
+                    "school": "Dorm Palace School",
+                    "class 2": {"Teacher: Jared Teacher": []},
+                }
+            ],
+        )
+        self.assertEqual(
+            list(self.client.get(self.url, {"class_to": 1}).json()[0]),
+            ["school", "class 1"],
+        )
+
+        for value in ("one", "²", "-1"):
+            response = self.client.get(self.url, {"class_from": value})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(self.url, {"school": "²"}).json(), [])
+
+    def test_pages_by_school(self):
+        # Count, schools, classes and personnel of the page.
+        with self.assertNumQueries(4):
+            response = self.client.get(self.url, {"page_size": 1})
+
+        data = response.json()
+        self.assertEqual(data["count"], 2)
+        self.assertEqual(
+            [school["school"] for school in data["results"]], ["Dorm Palace School"]
+        )
+        self.assertTrue(data["next"].endswith("?page=2&page_size=1"))
+
+        data = self.client.get(self.url, {"page": 2, "page_size": 1}).json()
+        self.assertEqual(
+            [school["school"] for school in data["results"]], ["Rose Garden School"]
+        )
+
+        response = self.client.get(self.url, {"page": 3, "page_size": 1})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_variants_are_cached_apart(self):
+        everything = self.client.get(self.url)
+        one_school = self.client.get(self.url, {"school": "Rose Garden School"})
+
+        self.assertEqual(len(everything.json()), 2)
+        self.assertEqual(len(one_school.json()), 1)
+        self.assertNotEqual(everything["ETag"], one_school["ETag"])
+        with self.assertNumQueries(0):
+            self.client.get(self.url, {"school": "Rose Garden School", "other": 1})
+
+    @override_settings(ALLOWED_HOSTS=["a.example", "b.example"])
+    def test_only_pages_are_cached_per_host(self):
+        self.client.get(self.url, HTTP_HOST="a.example")
+        with self.assertNumQueries(0):
+            self.client.get(self.url, HTTP_HOST="b.example")
+
+        self.client.get(self.url, {"page_size": 1}, HTTP_HOST="a.example")
+        response = self.client.get(self.url, {"page_size": 1}, HTTP_HOST="b.example")
+        self.assertTrue(response.json()["next"].startswith("http://b.example/"))
+
+
+class SchoolStructureTests(APITestCase):
+    url = "/api/school_structure/"
+
+    def create_tree(self, levels, rooms):
+        school = SchoolStructure.objects.create(title="School")
+        for level in range(1, levels + 1):
+            parent = SchoolStructure.objects.create(
+                title=f"Level {level}", parent=school
+            )
+            SchoolStructure.objects.bulk_create(
+                SchoolStructure(title=f"Room {level}/{room}", parent=parent)
+                for room in range(1, rooms + 1)
+            )
+
+    def test_tree(self):
+        self.create_tree(levels=2, rooms=2)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(
+            response.json(),
+            [
+                {
+                    "title": "School",
+                    "sub": [
+                        {
+                            "title": "Level 1",
+                            "sub": [{"title": "Room 1/1"}, {"title": "Room 1/2"}],
+                        },
+                        {
+                            "title": "Level 2",
+                            "sub": [{"title": "Room 2/1"}, {"title": "Room 2/2"}],
+                        },
+                    ],
+                }
+            ],
+        )
+
+    def test_constant_queries(self):
+        for levels, rooms in ((1, 1), (6, 50)):
+            SchoolStructure.objects.all().delete()
+            self.create_tree(levels, rooms)
+
+            with self.assertNumQueries(1):
+                self.client.get(self.url)
+
+    def test_child_before_parent(self):
+        rows = [(3, "Room", 2), (1, "School", None), (2, "Level", 1), (4, "Hall", 1)]
+
+        self.assertEqual(
+            build_structure_tree(rows),
+            [
+                {
+                    "title": "School",
+                    "sub": [
+                        {"title": "Level", "sub": [{"title": "Room"}]},
+                        {"title": "Hall"},
+                    ],
+                }
+            ],
+        )
+
+
+class SchoolStructurePathTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.lower = SchoolStructure.objects.create(title="Lower")
+        cls.upper = SchoolStructure.objects.create(title="Upper")
+        cls.grade_1 = cls.create_node("Grade 1", cls.lower)
+        cls.room_1 = cls.create_node("Room 1/1", cls.grade_1)
+        cls.room_2 = cls.create_node("Room 1/2", cls.grade_1)
+        cls.grade_4 = cls.create_node("Grade 4", cls.upper)
+
+    @staticmethod
+    def create_node(title, parent):
+        return SchoolStructure.objects.create(title=title, parent=parent)
+
+    def subtree(self, node, **params):
+        return self.client.get(f"/api/school_structure/{node.id}/subtree/", params)
+
+    def test_paths(self):
+        self.room_2.refresh_from_db()
+
+        ids = (self.lower.id, self.grade_1.id, self.room_2.id)
+        self.assertEqual(self.room_2.path, "".join(f"{pk:010d}" for pk in ids))
+        self.assertEqual(self.room_2.depth, 2)
+
+    def test_subtree(self):
+        # The node, then its branch.
+        with self.assertNumQueries(2):
+            response = self.subtree(self.lower)
+
+        self.assertEqual(
+            response.json(),
+            {
+                "title": "Lower",
+                "sub": [
+                    {
+                        "title": "Grade 1",
+                        "sub": [{"title": "Room 1/1"}, {"title": "Room 1/2"}],
+                    }
+                ],
+            },
+        )
+        self.assertEqual(
+            self.subtree(self.lower, depth=1).json(),
+            {"title": "Lower", "sub": [{"title": "Grade 1"}]},
+        )
+        self.assertEqual(self.subtree(self.room_1).json(), {"title": "Room 1/1"})
+        for depth in ("all", "²"):
+            self.assertEqual(
+                self.subtree(self.lower, depth=depth).status_code,
+                status.HTTP_400_BAD_REQUEST,
+            )
+
+    def test_subtree_uses_path_index(self):
+        plan = SchoolStructure.objects.subtree(self.lower).order_by("path").explain()
+
+        self.assertIn("INDEX apis_schoolstructure_path", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_ancestors(self):
+        url = f"/api/school_structure/{self.room_1.id}/ancestors/"
+
+        response = self.client.get(url)
+
+        self.assertEqual(
+            response.json(),
+            [
+                {"id": self.lower.id, "title": "Lower", "depth": 0},
+                {"id": self.grade_1.id, "title": "Grade 1", "depth": 1},
+            ],
+        )
+        response = self.client.get("/api/school_structure/0/ancestors/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_move_rewrites_branch(self):
+        self.grade_1.parent = self.grade_4
+        self.grade_1.save()
+
+        room = SchoolStructure.objects.get(id=self.room_1.id)
+        self.assertEqual(room.depth, 3)
+        self.assertEqual(
+            [node.title for node in SchoolStructure.objects.ancestors(room)],
+            ["Upper", "Grade 4", "Grade 1"],
+        )
+        self.assertEqual(self.subtree(self.lower).json(), {"title": "Lower"})
+        self.assertEqual(SchoolStructure.objects.subtree(self.upper).count(), 5)
+
+    def test_cannot_move_under_itself(self):
+        self.lower.parent = self.room_1
+
+        with self.assertRaises(ValidationError):
+            self.lower.save()
+
+    def test_rebuild_paths(self):
+        (room,) = SchoolStructure.objects.bulk_create(
+            [SchoolStructure(title="Room 1/3", parent=self.grade_1)]
+        )
+        for url in ("subtree", "ancestors"):
+            response = self.client.get(f"/api/school_structure/{room.id}/{url}/")
+            self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+        SchoolStructure.objects.rebuild_paths()
+
+        self.assertEqual(SchoolStructure.objects.subtree(self.grade_1).count(), 4)
+
+
+@unittest.skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN is SQLite's")
+class QueryPlanTests(SchoolAPITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        # Two classes, so the prefetches filter with IN and have to merge.
+        second_class = Classes.objects.create(
+            school=cls.student.school_class.school, class_order=2
+        )
+        for school_class, first_name in (
+            (cls.student.school_class, "Mark"),
+            (second_class, "Jared"),
+        ):
+            Personnel.objects.create(
+                first_name=first_name,
+                last_name="Teacher",
+                school_class=school_class,
+                personnel_type=0,
+            )
+
+    def setUp(self):
+        cache.clear()
+        credits.load_subject_credits()
+
+    def assertIndexedQueries(self, method, url, data=None):
+        """Fail if a SELECT run by the request scans a table or sorts."""
+        with CaptureQueriesContext(connection) as queries:
+            response = getattr(self.client, method)(url, data, format="json")
+        self.assertLess(response.status_code, 400)
+
+        selects = [
+            query["sql"] for query in queries if query["sql"].startswith("SELECT")
+        ]
+        self.assertTrue(selects)
+        for sql in selects:
+            with connection.cursor() as cursor:
+                cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+                plan = [row[-1] for row in cursor.fetchall()]
+            for step in plan:
+                with self.subTest(sql=sql, step=step):
+                    self.assertFalse(step.startswith("SCAN"))
+                    self.assertNotIn("TEMP B-TREE", step)
+
+    def test_personnel_details(self):
+        self.assertIndexedQueries("get", "/api/personnel_details/Dorm Palace School/")
+
+    def test_score_write(self):
+        self.assertIndexedQueries(
+            "post",
+            "/api/student_score/",
+            {
+                "first_name": "Aaron",
+                "last_name": "Marquez",
+                "subject_title": "Math",
+                "score": 90,
+            },
+        )
+
+    def test_school_hierarchy(self):
+        self.assertIndexedQueries(
+            "get", "/api/school_hierarchy/", {"school": "Dorm Palace School"}
+        )
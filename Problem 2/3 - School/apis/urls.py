@@ -6,10 +6,14 @@ urlpatterns = [
 
     # ========== API Endpoints ==================================+++++++++++++++=======================================
     path("student_score/", schools.StudentSubjectsScoreAPIView.as_view(), name="student_score"),
+    path("student_score/bulk/", schools.StudentSubjectsScoreBulkAPIView.as_view(), name="student_score_bulk"),
     path("student_score/<int:id>/", schools.StudentSubjectsScoreDetailsAPIView.as_view(), name="student_score_details"),
+    path("transcripts/<str:school_title>/", schools.SchoolTranscriptsAPIView.as_view(), name="transcripts"),
 
     path("personnel_details/<str:school_title>/", schools.PersonnelDetailsAPIView.as_view(), name="personnel_details"),
     path("school_hierarchy/", schools.SchoolHierarchyAPIView.as_view(), name="school_hierarchy"),
     path("school_structure/", schools.SchoolStructureAPIView.as_view(), name="school_structure"),
+    path("school_structure/<int:id>/subtree/", schools.SchoolStructureSubtreeAPIView.as_view(), name="school_structure_subtree"),
+    path("school_structure/<int:id>/ancestors/", schools.SchoolStructureAncestorsAPIView.as_view(), name="school_structure_ancestors"),
 
 ]
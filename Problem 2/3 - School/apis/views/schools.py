@@ -1,12 +1,31 @@
 import math
+from urllib.parse import urlencode
 
-from django.db.models import Prefetch
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, F, FloatField, Prefetch, Q, Sum, Value, When
+from django.db.models.functions import Coalesce
+from django.utils.cache import get_conditional_response
 from rest_framework import status
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework.exceptions import NotFound
+from rest_framework.exceptions import APIException, NotFound, ValidationError
 
-from apis.calculator.grade import get_grade, get_grade_points
+from apis.calculator.expressions import (
+    grade_expression,
+    grade_points_expression,
+    weighted_grade_points_expression,
+)
+from apis.calculator.grade import get_grade
+from apis.credits import get_subject_credit
+from apis.hierarchy import PrerenderedJSONRenderer, get_hierarchy_document
+from apis.summary import (
+    rebuild_summaries,
+    record_score_change,
+    weighted_grade_points,
+)
+from apis.pagination import SchoolPagination, TranscriptPagination
 from apis.serializers import ScoreCreateSerializer
 from apis.models import (
     SchoolStructure,
@@ -17,6 +36,52 @@ from apis.models import (
     StudentSubjectsScore,
 )
 
+SCORE_BULK_MAX_ITEMS = getattr(settings, "SCORE_BULK_MAX_ITEMS", 10000)
+
+# Name pairs per query when resolving students, SQLite parses a long chain
+# of ORs as a deeply nested expression.
+LOOKUP_CHUNK_SIZE = 300
+
+
+def get_int_param(request, name):
+    """
+    The non-negative integer query parameter `name`, None when absent.
+
+    Parsed with `int()`, `str.isdigit()` also accepts characters such as "²"
+    that `int()` rejects.
+    """
+    value = request.query_params.get(name)
+    if value is None:
+        return None
+    try:
+        value = int(value)
+    except ValueError:
+        raise ValidationError({name: ["A valid integer is required."]})
+    if value < 0:
+        raise ValidationError({name: ["A valid integer is required."]})
+    return value
+
+
+class PathNotBuilt(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = (
+        "The node has no path yet, run `SchoolStructure.objects.rebuild_paths()`."
+    )
+    default_code = "path_not_built"
+
+
+def get_structure_node(node_id):
+    """
+    The `SchoolStructure` node read by its `path`, raising 404 if it does not
+    exist and 409 if it was written without `save()` and has no path.
+    """
+    node = SchoolStructure.objects.filter(id=node_id).first()
+    if not node:
+        raise NotFound("Node Not Found")
+    if not node.path:
+        raise PathNotBuilt()
+    return node
+
 
 class StudentSubjectsScoreAPIView(APIView):
 
@@ -51,28 +116,6 @@ class StudentSubjectsScoreAPIView(APIView):
 
         """
 
-        subjects_context = [
-            {"id": 1, "title": "Math"},
-            {"id": 2, "title": "Physics"},
-            {"id": 3, "title": "Chemistry"},
-            {"id": 4, "title": "Algorithm"},
-            {"id": 5, "title": "Coding"},
-        ]
-
-        credits_context = [
-            {"id": 6, "credit": 1, "subject_id_list_that_using_this_credit": [3]},
-            {"id": 7, "credit": 2, "subject_id_list_that_using_this_credit": [2, 4]},
-            {"id": 9, "credit": 3, "subject_id_list_that_using_this_credit": [1, 5]},
-        ]
-
-        credits_mapping = [
-            {"subject_id": 1, "credit_id": 9},
-            {"subject_id": 2, "credit_id": 7},
-            {"subject_id": 3, "credit_id": 6},
-            {"subject_id": 4, "credit_id": 7},
-            {"subject_id": 5, "credit_id": 9},
-        ]
-
         serializer = ScoreCreateSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         validated_data = serializer.validated_data
@@ -93,35 +136,35 @@ class StudentSubjectsScoreAPIView(APIView):
         if not subject:
             raise NotFound("Subject Not Found")
 
-        subject_score = StudentSubjectsScore.objects.filter(
-            student=student, subjects=subject
-        ).first()
-
-        if subject_score:  # Student's score already existed, update score.
-            subject_score.score = score
-            subject_score.save()
-        else:  # Student's score not existed, create new score.
-            # Find the credit value using the credit_id from credits_context
-            credit_id = next(
-                (
-                    item["credit_id"]
-                    for item in credits_mapping
-                    if item["subject_id"] == subject.id
-                ),
-                None,
+        with transaction.atomic():
+            # Locked until the summary is updated, so a concurrent update of
+            # the same score cannot compute its delta from the same old score.
+            subject_score = (
+                StudentSubjectsScore.objects.select_for_update()
+                .filter(student=student, subjects=subject)
+                .first()
             )
-            credit = next(
-                (item["credit"] for item in credits_context if item["id"] == credit_id),
-                0,
-            )
-            payload = {
-                "score": score,
-                "credit": credit,
-                "student_id": student.id,
-                "subjects_id": subject.id,
-            }
-            subject_score = StudentSubjectsScore(**payload)
-            subject_score.save()
+
+            if subject_score:  # Student's score already existed, update score.
+                credit_delta = 0
+                points_delta = weighted_grade_points(
+                    subject_score.credit, score
+                ) - weighted_grade_points(subject_score.credit, subject_score.score)
+                subject_score.score = score
+                subject_score.save()
+            else:  # Student's score not existed, create new score.
+                payload = {
+                    "score": score,
+                    "credit": get_subject_credit(subject.id),
+                    "student_id": student.id,
+                    "subjects_id": subject.id,
+                }
+                subject_score = StudentSubjectsScore(**payload)
+                subject_score.save()
+                credit_delta = subject_score.credit
+                points_delta = weighted_grade_points(subject_score.credit, score)
+
+            record_score_change(student.id, credit_delta, points_delta)
 
         response = {
             "student": {
@@ -135,6 +178,109 @@ class StudentSubjectsScoreAPIView(APIView):
         return Response(data=response, status=status.HTTP_201_CREATED)
 
 
+class StudentSubjectsScoreBulkAPIView(APIView):
+
+    @staticmethod
+    def post(request, *args, **kwargs):
+        """
+        description: insert or update a list of scores in one request, for end-of-term imports.
+
+        payload:    list of `{"first_name", "last_name", "subject_title", "score"}` items, at most
+                        SCORE_BULK_MAX_ITEMS of them.
+
+        rules:      - Same rules as `StudentSubjectsScoreAPIView`, checked for each item.
+                    - Students and subjects are resolved with set-based queries and the scores are
+                            written with one upsert on `unique_subject_score`, only `score` is updated
+                            so the credit of an existing score never changes.
+                    - Invalid items and items whose student or subject is not found are skipped and
+                            reported by their index, the other items are saved.
+                    - When an item appears twice for the same student and subject, the last one wins.
+                    - The summaries of the students written to are recomputed in the same transaction.
+
+        """
+
+        items = request.data
+        if not isinstance(items, list) or not items:
+            raise ValidationError("Expected a non-empty list of scores.")
+        if len(items) > SCORE_BULK_MAX_ITEMS:
+            raise ValidationError(
+                f"Ensure this list has no more than {SCORE_BULK_MAX_ITEMS} scores."
+            )
+
+        errors = []
+        valid = []
+        for index, item in enumerate(items):
+            serializer = ScoreCreateSerializer(data=item)
+            if serializer.is_valid():
+                valid.append((index, serializer.validated_data))
+            else:
+                errors.append({"index": index, "errors": serializer.errors})
+
+        students = find_students(
+            {(data["first_name"], data["last_name"]) for _, data in valid}
+        )
+        subjects = dict(
+            Subjects.objects.filter(
+                title__in={data["subject_title"] for _, data in valid}
+            ).values_list("title", "id")
+        )
+
+        scores = {}
+        for index, data in valid:
+            student_id = students.get((data["first_name"], data["last_name"]))
+            subject_id = subjects.get(data["subject_title"])
+            if student_id is None:
+                errors.append(
+                    {"index": index, "errors": {"non_field_errors": ["Student Not Found"]}}
+                )
+            elif subject_id is None:
+                errors.append(
+                    {"index": index, "errors": {"non_field_errors": ["Subject Not Found"]}}
+                )
+            else:
+                scores[student_id, subject_id] = StudentSubjectsScore(
+                    student_id=student_id,
+                    subjects_id=subject_id,
+                    credit=get_subject_credit(subject_id),
+                    score=data["score"],
+                )
+
+        with transaction.atomic():
+            StudentSubjectsScore.objects.bulk_create(
+                scores.values(),
+                update_conflicts=True,
+                unique_fields=["student", "subjects"],
+                update_fields=["score"],
+            )
+            rebuild_summaries({student_id for student_id, _ in scores})
+
+        errors.sort(key=lambda error: error["index"])
+        response = {"saved": len(scores), "errors": errors}
+        return Response(response, status=status.HTTP_200_OK)
+
+
+def find_students(names, chunk_size=LOOKUP_CHUNK_SIZE):
+    """
+    Map `(first_name, last_name)` pairs to personnel ids, with one query per
+    `chunk_size` pairs. Like `.first()`, a duplicated name resolves to the
+    lowest id.
+    """
+    names = list(names)
+    students = {}
+    for start in range(0, len(names), chunk_size):
+        condition = Q()
+        for first_name, last_name in names[start : start + chunk_size]:
+            condition |= Q(first_name=first_name, last_name=last_name)
+        rows = Personnel.objects.filter(condition).values_list(
+            "first_name", "last_name", "id"
+        )
+        for first_name, last_name, pk in rows:
+            key = first_name, last_name
+            if key not in students or pk < students[key]:
+                students[key] = pk
+    return students
+
+
 class StudentSubjectsScoreDetailsAPIView(APIView):
 
     @staticmethod
@@ -182,47 +328,38 @@ class StudentSubjectsScoreDetailsAPIView(APIView):
         }
 
         subject_details = []
-        total_grade_points = 0
-        total_credits = 0
         gpa = 0
 
+        # The student, school and GPA come from one primary key lookup, the
+        # GPA is maintained by `apis.summary` on every score write.
         student_id = kwargs.get("id", None)
-        student = Personnel.objects.filter(id=student_id).first()
+        student = (
+            Personnel.objects.select_related("school_class__school", "summary")
+            .filter(id=student_id)
+            .first()
+        )
 
         if not student:
             return Response(status=status.HTTP_404_NOT_FOUND)
 
-        classes = (
-            Classes.objects.select_related("school")
-            .filter(id=student.school_class_id)
-            .first()
-        )
+        classes = student.school_class
 
         subject_score = StudentSubjectsScore.objects.select_related("subjects").filter(
             student_id=student_id,
         )
 
-        if subject_score:
-            for subject_score in subject_score:
-                subject = subject_score.subjects.title
-                credit = subject_score.credit
-                score = subject_score.score
-
-                grade = get_grade(score)
-                grade_points = get_grade_points(grade)
-                total_grade_points += grade_points * credit
-                total_credits += credit
-
-                subject_details.append(
-                    {
-                        "subject": subject,
-                        "credit": credit,
-                        "score": score,
-                        "grade": grade,
-                    }
-                )
+        for subject_score in subject_score:
+            subject_details.append(
+                {
+                    "subject": subject_score.subjects.title,
+                    "credit": subject_score.credit,
+                    "score": subject_score.score,
+                    "grade": get_grade(subject_score.score),
+                }
+            )
 
-            gpa = total_grade_points / total_credits
+        if hasattr(student, "summary"):
+            gpa = student.summary.grade_point_average
 
         student_dict = {
             "id": student.id,
@@ -239,6 +376,104 @@ class StudentSubjectsScoreDetailsAPIView(APIView):
         return Response(response, status=status.HTTP_200_OK)
 
 
+class SchoolTranscriptsAPIView(APIView):
+
+    pagination_class = TranscriptPagination
+
+    def get(self, request, *args, **kwargs):
+        """
+        description: get the transcript of every student of a school, or of one class with `?class_order=`,
+                    for printing report cards.
+
+        pattern:     Paginated list of the context returned by `StudentSubjectsScoreDetailsAPIView`, each
+                    subject detail also carries its `grade_points`. Page with `?page=` and `?page_size=`.
+
+        rules:      - Students are ordered by their class order and their name.
+                    - Grades, grade points and grade point averages are computed by the database with the
+                            boundaries in `apis.calculator.grade`, a page costs a fixed number of queries
+                            whatever its size.
+                    - If School's title not found return not found status.
+
+        """
+
+        school_title = kwargs.get("school_title", None)
+        school = Schools.objects.filter(title=school_title).first()
+        if not school:
+            raise NotFound("School Not Found")
+
+        students = Personnel.objects.filter(
+            school_class__school=school, personnel_type=2
+        )
+        class_order = get_int_param(request, "class_order")
+        if class_order is not None:
+            students = students.filter(school_class__class_order=class_order)
+
+        students = (
+            students.select_related("school_class")
+            .annotate(
+                total_credits=Coalesce(Sum("studentsubjectsscore__credit"), 0),
+                total_grade_points=Coalesce(
+                    Sum(
+                        weighted_grade_points_expression(
+                            "studentsubjectsscore__score",
+                            "studentsubjectsscore__credit",
+                        )
+                    ),
+                    0.0,
+                ),
+                grade_point_average=Case(
+                    When(
+                        total_credits__gt=0,
+                        then=F("total_grade_points") / F("total_credits"),
+                    ),
+                    default=Value(0.0),
+                    output_field=FloatField(),
+                ),
+            )
+            .order_by("school_class__class_order", "first_name", "last_name", "id")
+        )
+
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(students, request, view=self)
+
+        subject_details = {student.id: [] for student in page}
+        scores = (
+            StudentSubjectsScore.objects.filter(student_id__in=subject_details)
+            .annotate(grade=grade_expression(), grade_points=grade_points_expression())
+            .order_by("id")
+            .values_list(
+                "student_id", "subjects__title", "credit", "score", "grade", "grade_points"
+            )
+        )
+        for student_id, subject, credit, score, grade, grade_points in scores:
+            subject_details[student_id].append(
+                {
+                    "subject": subject,
+                    "credit": credit,
+                    "score": score,
+                    "grade": grade,
+                    "grade_points": grade_points,
+                }
+            )
+
+        transcripts = [
+            {
+                "student": {
+                    "id": student.id,
+                    "full_name": student.first_name + " " + student.last_name,
+                    "school": school.title,
+                    "class": student.school_class.class_order,
+                },
+                "subject_detail": subject_details[student.id],
+                "grade_point_average": (
+                    math.floor(student.grade_point_average * 100) / 100
+                ),
+            }
+            for student in page
+        ]
+        return paginator.get_paginated_response(transcripts)
+
+
 class PersonnelDetailsAPIView(APIView):
 
     def get(self, request, *args, **kwargs):
@@ -330,13 +565,34 @@ class PersonnelDetailsAPIView(APIView):
 
         school_title = kwargs.get("school_title", None)
 
-        personnel_details = (
-            Personnel.objects.filter(school_class__school__title=school_title)
-            .select_related("school_class", "school_class__school")
-            .order_by(
-                "personnel_type", "school_class__class_order", "first_name", "last_name"
-            )
+        # One query per role, each walks the school's classes in order and
+        # reads their personnel from `personnel_class_order_idx` already
+        # sorted by name. Ordering by the role in a single query would sort
+        # the whole school in a temporary B-tree.
+        personnel = Personnel.objects.filter(
+            school_class__school__title=school_title
+        ).select_related("school_class", "school_class__school")
+        # Any other type is listed as "Unknown" before or after the known
+        # roles, there are too few of them to need the index order.
+        unknown = sorted(
+            personnel.exclude(personnel_type__in=personnel_roles),
+            key=lambda person: (
+                person.personnel_type,
+                person.school_class.class_order,
+                person.first_name,
+                person.last_name,
+            ),
         )
+        personnel_details = [
+            person for person in unknown if person.personnel_type < min(personnel_roles)
+        ]
+        for personnel_type in personnel_roles:
+            personnel_details += personnel.filter(
+                personnel_type=personnel_type
+            ).order_by("school_class__class_order", "first_name", "last_name")
+        personnel_details += [
+            person for person in unknown if person.personnel_type > max(personnel_roles)
+        ]
 
         data_pattern = []
         for index, person in enumerate(personnel_details, start=1):
@@ -352,8 +608,11 @@ class PersonnelDetailsAPIView(APIView):
 
 class SchoolHierarchyAPIView(APIView):
 
-    @staticmethod
-    def get(request, *args, **kwargs):
+    pagination_class = SchoolPagination
+    renderer_classes = [PrerenderedJSONRenderer, BrowsableAPIRenderer]
+    filter_params = ("school", "class_from", "class_to")
+
+    def get(self, request, *args, **kwargs):
         """
         [Logical Test]
 
@@ -361,6 +620,11 @@ class SchoolHierarchyAPIView(APIView):
 
         pattern: in `data_pattern` variable below.
 
+        filters:    - `school`: only the school with this title or id.
+                    - `class_from`, `class_to`: only the classes whose order is in this inclusive range.
+                    - `page`, `page_size`: page by school, the list is then wrapped in `count`, `next`,
+                            `previous` and `results`. Without them every school is returned.
+
         """
 
         data_pattern = [
@@ -600,32 +864,101 @@ class SchoolHierarchyAPIView(APIView):
             },
         ]
 
-        personnel_roles = {
-            0: "Teacher",
-            1: "Head of the room",
-            2: "Student",
-        }
+        filters = self.get_filters(request)
+        paginator = None
+        pagination_params = ("page", self.pagination_class.page_size_query_param)
+        if any(name in request.query_params for name in pagination_params):
+            paginator = self.pagination_class()
+
+        def build():
+            schools = self.get_schools(**filters)
+            if paginator is None:
+                return self.build_hierarchy(schools)
+            page = paginator.paginate_queryset(schools, request, view=self)
+            return paginator.get_paginated_response(self.build_hierarchy(page)).data
+
+        known_params = sorted(
+            (name, value)
+            for name, value in request.query_params.items()
+            if name in self.filter_params + pagination_params
+        )
+        variant = f"?{urlencode(known_params)}"
+        if paginator is not None:
+            # Paginated responses link to other pages by absolute URL, other
+            # responses are shared by every host the request names.
+            variant = request.build_absolute_uri(request.path) + variant
+        content, etag = get_hierarchy_document(build, variant)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = Response(content, status=status.HTTP_200_OK)
+        response["ETag"] = etag
+        return response
+
+    @staticmethod
+    def get_filters(request):
+        filters = {}
+        school = request.query_params.get("school")
+        if school:
+            filters["school"] = school
+        for name in ("class_from", "class_to"):
+            value = get_int_param(request, name)
+            if value is not None:
+                filters[name] = value
+        return filters
 
-        # Define a custom prefetch for personnel to sort them by role and name within the query
+    @staticmethod
+    def get_schools(school=None, class_from=None, class_to=None):
+        """
+        Schools ordered by title with their classes and personnel prefetched,
+        the filters are applied in the schools and classes queries.
+        """
+        schools = Schools.objects.order_by("title")
+        if school is not None:
+            condition = Q(title=school)
+            try:
+                condition |= Q(id=int(school))
+            except ValueError:
+                pass
+            schools = schools.filter(condition)
+
+        # Led by the school like the `unique_school_order` index.
+        classes = Classes.objects.order_by("school_id", "class_order")
+        if class_from is not None:
+            classes = classes.filter(class_order__gte=class_from)
+        if class_to is not None:
+            classes = classes.filter(class_order__lte=class_to)
+
+        # Define a custom prefetch for personnel to sort them by role and name within the query,
+        # led by the class like `personnel_class_order_idx` so the index returns them sorted
         personnel_prefetch = Prefetch(
             "personnel_set",
             queryset=Personnel.objects.order_by(
-                "-personnel_type", "first_name", "last_name"
+                "school_class_id", "-personnel_type", "first_name", "last_name"
             ),
             to_attr="ordered_personnel",
         )
 
         # Fetch schools and prefetch related classes and personnel
-        schools = Schools.objects.order_by("title").prefetch_related(
+        return schools.prefetch_related(
             Prefetch(
                 "classes_set",
-                queryset=Classes.objects.order_by("class_order").prefetch_related(
-                    personnel_prefetch
-                ),
+                queryset=classes.prefetch_related(personnel_prefetch),
                 to_attr="ordered_classes",
             )
         )
 
+    @staticmethod
+    def build_hierarchy(schools):
+        """
+        Build the hierarchy of `schools` from `get_schools`, the result is
+        cached by `apis.hierarchy` until a school, class or personnel changes.
+        """
+        personnel_roles = {
+            0: "Teacher",
+            1: "Head of the room",
+            2: "Student",
+        }
+
         context_data = []
 
         for school in schools:
@@ -658,7 +991,35 @@ class SchoolHierarchyAPIView(APIView):
 
             context_data.append(school_info)
 
-        return Response(context_data, status=status.HTTP_200_OK)
+        return context_data
+
+
+def build_structure_tree(rows, root_parent_id=None):
+    """
+    Build the nested structure from `(id, title, parent_id)` rows in one
+    pass. Nodes with children get a `sub` list, in the order of `rows`, the
+    roots are the nodes whose parent is `root_parent_id`.
+
+    A child may come before its parent, the parent is then created as a
+    placeholder and gets its title when its own row is reached.
+    """
+    nodes = {}
+    roots = []
+    for node_id, title, parent_id in rows:
+        node = nodes.get(node_id)
+        if node is None:
+            node = nodes[node_id] = {"title": title}
+        else:
+            node["title"] = title
+
+        if parent_id == root_parent_id:
+            roots.append(node)
+        else:
+            parent = nodes.get(parent_id)
+            if parent is None:
+                parent = nodes[parent_id] = {"title": None}
+            parent.setdefault("sub", []).append(node)
+    return roots
 
 
 class SchoolStructureAPIView(APIView):
@@ -759,35 +1120,60 @@ class SchoolStructureAPIView(APIView):
             },
         ]
 
-        # Fetch all nodes at once, reduce duplicates queries
-        all_nodes = SchoolStructure.objects.prefetch_related(
-            "schoolstructure_set"
-        ).all()
+        # Fetch all nodes at once, only the columns the tree needs
+        rows = SchoolStructure.objects.order_by("id").values_list(
+            "id", "title", "parent_id"
+        )
+        context_data = build_structure_tree(rows)
 
-        # Dictionary mapping data
-        structured_data_helper = {}
-        context_data = []
+        return Response(context_data, status=status.HTTP_200_OK)
 
-        # Create a base dictionary entry for each node
-        for node in all_nodes:
-            structured_data_helper[node.id] = {"title": node.title}
-
-        # Populate the 'sub' lists based on parent-child relationships
-        for node in all_nodes:
-            # If the node has children, initialize 'sub' key
-            if (
-                hasattr(node, "schoolstructure_set")
-                and node.schoolstructure_set.exists()
-            ):
-                structured_data_helper[node.id]["sub"] = []
-
-            if node.parent_id is None:
-                context_data.append(structured_data_helper[node.id])
-            else:
-                # Ensure 'sub' list exists for the parent before appending
-                parent_dict = structured_data_helper[node.parent_id]
-                if "sub" not in parent_dict:
-                    parent_dict["sub"] = []
-                parent_dict["sub"].append(structured_data_helper[node.id])
+
+class SchoolStructureSubtreeAPIView(APIView):
+
+    @staticmethod
+    def get(request, *args, **kwargs):
+        """
+        description: get one node of the School's structure with everything under it, in the same pattern
+                    as `SchoolStructureAPIView`. `?depth=` limits how many levels under the node are returned.
+
+        rules:      - The branch is read with one range query on the indexed `path`, its cost depends on the
+                            size of the branch, not of the whole structure.
+                    - If the node not found return not found status.
+                    - If the node has no path (written without `save()`) return conflict status.
+
+        """
+
+        node = get_structure_node(kwargs.get("id", None))
+        max_depth = get_int_param(request, "depth")
+
+        # Ordered by path, parents come before their children and siblings
+        # keep the id order of `SchoolStructureAPIView`.
+        rows = (
+            SchoolStructure.objects.subtree(node, max_depth)
+            .order_by("path")
+            .values_list("id", "title", "parent_id")
+        )
+        (context_data,) = build_structure_tree(rows, root_parent_id=node.parent_id)
 
         return Response(context_data, status=status.HTTP_200_OK)
+
+
+class SchoolStructureAncestorsAPIView(APIView):
+
+    @staticmethod
+    def get(request, *args, **kwargs):
+        """
+        description: get the nodes above one node of the School's structure, from the root down to its parent.
+
+        rules:      - The ancestors are read by primary key from the ids in the node's `path`.
+                    - If the node not found return not found status.
+                    - If the node has no path (written without `save()`) return conflict status.
+
+        """
+
+        node = get_structure_node(kwargs.get("id", None))
+        ancestors = SchoolStructure.objects.ancestors(node).values(
+            "id", "title", "depth"
+        )
+        return Response(list(ancestors), status=status.HTTP_200_OK)